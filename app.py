@@ -834,34 +834,29 @@ class ChunkTracker:
                     cleanup_reason = ""
 
                     if file_id not in all_tracked_files:
-                        # Check age before cleanup
-                        timestamp_file = os.path.join(chunk_dir, ".timestamp")
-
-                        if os.path.exists(timestamp_file):
+                        # Check age before cleanup. Last activity is the
+                        # chunk dir's mtime — storage.save_chunk() bumps it on
+                        # every chunk. A .timestamp file (written by older
+                        # versions) is only consulted if the mtime can't be read.
+                        try:
+                            timestamp = os.path.getmtime(chunk_dir)
+                        except OSError:
                             try:
+                                timestamp_file = os.path.join(chunk_dir, ".timestamp")
                                 with open(timestamp_file, "r") as f:
                                     timestamp = float(f.read().strip())
-                                # Cleanup untracked chunks older than 45 minutes.
-                                # Must be > cleanup_interrupted_uploads timeout (30 min)
-                                # so we never delete chunks that are simply backgrounded.
-                                if current_time - timestamp > 2700:
-                                    should_cleanup = True
-                                    cleanup_reason = (
-                                        f"untracked >45min old (abandoned upload)"
-                                    )
                             except (ValueError, OSError):
-                                should_cleanup = True
-                                cleanup_reason = "corrupted timestamp file"
-                        else:
-                            # No timestamp, cleanup if dir is older than 45 minutes
-                            try:
-                                dir_mtime = os.path.getmtime(chunk_dir)
-                                if current_time - dir_mtime > 2700:
-                                    should_cleanup = True
-                                    cleanup_reason = "no timestamp >45min old"
-                            except OSError:
-                                should_cleanup = True
-                                cleanup_reason = "cannot read metadata"
+                                timestamp = None
+
+                        if timestamp is None:
+                            should_cleanup = True
+                            cleanup_reason = "cannot read metadata"
+                        # Cleanup untracked chunks older than 45 minutes.
+                        # Must be > cleanup_interrupted_uploads timeout (30 min)
+                        # so we never delete chunks that are simply backgrounded.
+                        elif current_time - timestamp > 2700:
+                            should_cleanup = True
+                            cleanup_reason = f"untracked >45min old (abandoned upload)"
                     else:
                         # Even tracked files - cleanup if very old (stale uploads)
                         file_timestamp = self.upload_timestamps.get(
@@ -3979,10 +3974,7 @@ def storage_stats_api():
         current_snapshot = file_monitor.get_current_snapshot()
 
         # Get fast disk stats only (no file counting)
-        from realtime_stats import StorageStatsEventManager
-
-        event_manager = StorageStatsEventManager()
-        disk_stats = event_manager._get_fast_disk_stats()
+        disk_stats = storage.get_disk_usage()
 
         # Build instant stats response
         if current_snapshot:
@@ -4021,7 +4013,8 @@ def storage_stats_api():
 @app.route("/api/storage_stats_slow", methods=["GET"])
 @login_required
 def storage_stats_slow_api():
-    """Get storage statistics - SLOW VERSION with full file counting"""
+    """Get storage statistics via storage.get_storage_stats() — counts come
+    from the file monitor's index (a bounded walk only before it exists)"""
     try:
         print(
             f"📊 SLOW Storage stats API called by user: {session.get('username', 'unknown')}"
@@ -4096,10 +4089,7 @@ def storage_stats_poll():
             current_time = time.time()
 
             # Get quick disk stats only
-            from realtime_stats import StorageStatsEventManager
-
-            event_manager = StorageStatsEventManager()
-            disk_stats = event_manager._get_fast_disk_stats()
+            disk_stats = storage.get_disk_usage()
 
             # Use cached snapshot if available, otherwise provide placeholder
             current_snapshot = file_monitor.get_current_snapshot()
@@ -4194,10 +4184,7 @@ def storage_stats_poll():
         )
 
         # Get disk stats
-        from realtime_stats import StorageStatsEventManager
-
-        event_manager = StorageStatsEventManager()
-        disk_stats = event_manager._get_fast_disk_stats()
+        disk_stats = storage.get_disk_usage()
 
         response_data = {
             "type": "polling_response",
@@ -1,3 +1,4 @@
+import errno
 import os
 import platform
 import subprocess
@@ -216,6 +217,29 @@ def get_accessible_storage_path():
         return os.path.join(os.getcwd(), "uploads")
 
 
+def probe_write(dir_path):
+    """Raise OSError unless a file can actually be created in dir_path.
+
+    On Linux, O_TMPFILE creates an unnamed inode that is freed on close — no
+    write, no unlink, and nothing left behind if we crash mid-probe. Platforms
+    or filesystems without O_TMPFILE fall back to a named probe file.
+    """
+    o_tmpfile = getattr(os, "O_TMPFILE", 0)
+    if o_tmpfile:
+        try:
+            os.close(os.open(dir_path, os.O_WRONLY | o_tmpfile, 0o600))
+            return
+        except OSError as e:
+            # Filesystem/kernel lacks O_TMPFILE support — use the fallback.
+            # Anything else (EACCES, EROFS, ...) is a genuine answer.
+            if e.errno not in (errno.EOPNOTSUPP, errno.EISDIR, errno.EINVAL):
+                raise
+    test_file = os.path.join(dir_path, ".write_test")
+    with open(test_file, "w") as f:
+        f.write("test")
+    os.remove(test_file)
+
+
 def setup_storage_directory():
     """Create and verify the storage directory"""
     custom_path = None
@@ -243,10 +267,7 @@ def setup_storage_directory():
         os.makedirs(storage_path, exist_ok=True)
 
         # Test write permissions
-        test_file = os.path.join(storage_path, ".write_test")
-        with open(test_file, "w") as f:
-            f.write("test")
-        os.remove(test_file)
+        probe_write(storage_path)
 
         print(f"✅ Storage directory ready: {storage_path}")
 
@@ -373,10 +394,7 @@ def set_custom_storage_path(custom_path, use_subfolder=True):
         os.makedirs(expanded_path, exist_ok=True)
 
         # Test write permissions
-        test_file = os.path.join(expanded_path, ".write_test")
-        with open(test_file, "w") as f:
-            f.write("test")
-        os.remove(test_file)
+        probe_write(expanded_path)
 
         # Save via paths._save() — merge-write so db_path/cache_path
         # already in storage_config.json are never overwritten.
@@ -1007,10 +1025,7 @@ def _check_path(path):
     if not os.path.exists(path):
         return False, False
     try:
-        test = os.path.join(path, ".write_test")
-        with open(test, "w") as f:
-            f.write("test")
-        os.remove(test)
+        probe_write(path)
         return True, True
     except Exception:
         return True, False
@@ -58,6 +58,9 @@ _SECRET_PATH = os.path.join(_DB_DIR, "session.secret")
 
 _write_lock = threading.Lock()
 
+# bcrypt cost for the seeded default accounts only (see _bootstrap).
+_SEED_BCRYPT_ROUNDS = 10
+
 
 # ------------------------------------------------------------------
 # Fernet encryption — lazy
@@ -217,11 +220,16 @@ def _do_bootstrap(conn):
 
     count = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
     if count == 0:
+        # The seeded passwords are public placeholders the admin is told to
+        # change, so hash them at a lower cost to keep first start fast. Real
+        # passwords (add_user / update_password) keep bcrypt's default cost.
         for username, password, role in [
             ("admin", "admin123", "readwrite"),
             ("guest", "guest123", "readonly"),
         ]:
-            bcrypt_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+            bcrypt_hash = bcrypt.hashpw(
+                password.encode(), bcrypt.gensalt(rounds=_SEED_BCRYPT_ROUNDS)
+            ).decode()
             nt_hash_enc = (
                 _encrypt(_compute_nthash(password).hex()) if _SMB_AVAILABLE else None
             )
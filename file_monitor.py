@@ -59,9 +59,13 @@ WALK_PROGRESS_MIN_INTERVAL = 1.0  # (unused — kept for reference only)
 POST_WALK_DRAIN = 6.0  # seconds — enough for OS to drain ~100k queued events
 
 
-@dataclass
+@dataclass(frozen=True)
 class StorageSnapshot:
-    """Lightweight snapshot — kept identical to original for app.py compatibility"""
+    """Lightweight snapshot — kept identical to original for app.py compatibility.
+
+    Frozen: the monitor publishes a new instance by rebinding last_snapshot,
+    never by mutating one, so readers can take it without any lock.
+    """
 
     file_count: int
     dir_count: int
@@ -985,7 +989,8 @@ class FileSystemMonitor:
         print("💾 Cache saved on shutdown")
 
     def get_current_snapshot(self) -> Optional[StorageSnapshot]:
-        """Identical interface to original"""
+        """Identical interface to original. Lock-free — safe to call from every
+        new SSE connection; the returned snapshot is immutable."""
         return self.last_snapshot
 
     def get_stats_dict(self) -> Dict:
@@ -117,6 +117,11 @@ if __name__ == "__main__":
             connection_limit=500,
             channel_timeout=30,
             cleanup_interval=5,
+            # Keep this: it makes Waitress's own vendored event loop (wasyncore,
+            # not the stdlib asyncore removed in Python 3.12) wait with poll()
+            # instead of select(), which is capped at FD_SETSIZE (1024) sockets
+            # — too few once long-lived SSE streams pile up. Platforms without
+            # select.poll (Windows) fall back to select() automatically.
             asyncore_use_poll=True,
         )
 
@@ -144,7 +149,7 @@ if __name__ == "__main__":
         # lanman_guard.py for why that's the right model.
         protocol_manager.stop_all()
 
-        # Brief pause — lets asyncore close the listening socket
+        # Brief pause — lets Waitress close the listening socket
         _time.sleep(0.3)
 
         active = [
@@ -4,6 +4,7 @@ Real-time Storage Stats Broadcasting
 Handles WebSocket connections and Server-Sent Events for live storage updates
 """
 
+import os
 import json
 import time
 import threading
@@ -11,6 +12,36 @@ from flask import request, Response
 from queue import Queue, Empty
 from typing import Dict, Set
 from dataclasses import asdict
+import storage
+
+# Opt-in (CLOUDINATOR_DEBUG=1). Per-client and per-broadcast chatter fires on
+# every file event; console writes are slow (synchronous on Windows), so they
+# stay out of the broadcast path unless explicitly asked for. Errors and the
+# disconnected-client summary always print.
+_DEBUG = os.environ.get("CLOUDINATOR_DEBUG") == "1"
+
+# orjson is optional — a C serializer several times faster than json.dumps on
+# these small, hot SSE payloads. Both paths produce compact UTF-8 bytes.
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _sse_frame(obj) -> bytes:
+    """Encode one SSE `data:` frame"""
+    return b"data: " + _dumps(obj) + b"\n\n"
+
+
+# A broadcast frame younger than this is reused verbatim as a new client's
+# initial stats instead of rebuilding it from the file monitor.
+_INITIAL_STATS_MAX_AGE = 2.0
 
 
 class StorageStatsEventManager:
@@ -25,13 +56,15 @@ class StorageStatsEventManager:
         """Add a new client to receive updates"""
         with self.lock:
             self.clients.add(client_queue)
-            print(f"📡 Client connected. Total clients: {len(self.clients)}")
+            if _DEBUG:
+                print(f"📡 Client connected. Total clients: {len(self.clients)}")
 
     def remove_client(self, client_queue: Queue):
         """Remove a client from updates"""
         with self.lock:
             self.clients.discard(client_queue)
-            print(f"📡 Client disconnected. Total clients: {len(self.clients)}")
+            if _DEBUG:
+                print(f"📡 Client disconnected. Total clients: {len(self.clients)}")
 
     def broadcast_update(
         self,
@@ -103,30 +136,33 @@ class StorageStatsEventManager:
 
             self.last_stats = update_data
 
-            # Broadcast to all clients
+            # Broadcast to all clients. Only the copy is taken under the lock —
+            # a slow put() must not block clients connecting or disconnecting.
             with self.lock:
-                disconnected_clients = set()
-                for client_queue in self.clients:
-                    try:
-                        # Non-blocking put with timeout
-                        client_queue.put(update_data, timeout=0.1)
-                    except:
-                        # Client queue is full or closed, mark for removal
-                        disconnected_clients.add(client_queue)
-
-                # Remove disconnected clients
-                for client in disconnected_clients:
-                    self.clients.discard(client)
-
-                if disconnected_clients:
-                    print(
-                        f"📡 Removed {len(disconnected_clients)} disconnected clients"
-                    )
-
-            print(f"📡 Broadcasted storage update to {len(self.clients)} clients")
-            print(
-                f"🔍 Update data includes: files={update_data['data']['file_count']}, dirs={update_data['data']['dir_count']}, total_space={update_data['data']['total_space']}, free_space={update_data['data']['free_space']}"
-            )
+                clients_snapshot = tuple(self.clients)
+
+            disconnected_clients = set()
+            for client_queue in clients_snapshot:
+                try:
+                    # Non-blocking put with timeout
+                    client_queue.put(update_data, timeout=0.1)
+                except:
+                    # Client queue is full or closed, mark for removal
+                    disconnected_clients.add(client_queue)
+
+            # Remove disconnected clients
+            if disconnected_clients:
+                with self.lock:
+                    self.clients.difference_update(disconnected_clients)
+                print(f"📡 Removed {len(disconnected_clients)} disconnected clients")
+
+            if _DEBUG:
+                print(
+                    f"📡 Broadcasted storage update to {len(clients_snapshot) - len(disconnected_clients)} clients"
+                )
+                print(
+                    f"🔍 Update data includes: files={update_data['data']['file_count']}, dirs={update_data['data']['dir_count']}, total_space={update_data['data']['total_space']}, free_space={update_data['data']['free_space']}"
+                )
 
         except Exception as e:
             print(f"❌ Error broadcasting update: {e}")
@@ -142,44 +178,9 @@ class StorageStatsEventManager:
 
     def _get_fast_disk_stats(self):
         """Get fast disk usage stats without expensive file counting"""
-        import os
-        import shutil
-        from config import ROOT_DIR
-
         try:
-            # Determine the best path for disk usage calculation
-            disk_usage_path = ROOT_DIR
-
-            # Special handling for Android/Termux
-            if "TERMUX_VERSION" in os.environ or os.path.exists(
-                "/data/data/com.termux"
-            ):
-                android_storage_paths = [
-                    "/storage/emulated/0",
-                    "/sdcard",
-                    "/storage/self/primary",
-                ]
-
-                for path in android_storage_paths:
-                    if os.path.exists(path) and os.access(path, os.R_OK):
-                        disk_usage_path = path
-                        break
-
-            # Get disk usage only
-            if hasattr(os, "statvfs"):  # Unix-like systems
-                try:
-                    stat = os.statvfs(disk_usage_path)
-                    total = stat.f_blocks * stat.f_frsize
-                    free = stat.f_bavail * stat.f_frsize
-                    used = total - free
-                except OSError:
-                    # Fallback to shutil
-                    total, used, free = shutil.disk_usage(disk_usage_path)
-            else:  # Windows
-                total, used, free = shutil.disk_usage(ROOT_DIR)
-
-            return {"total_space": total, "used_space": used, "free_space": free}
-
+            # One implementation for SSE and the HTTP endpoints
+            return storage.get_disk_usage()
         except Exception as e:
             print(f"❌ Error getting fast disk stats: {e}")
             return {"total_space": 0, "used_space": 0, "free_space": 0}
@@ -189,6 +190,60 @@ class StorageStatsEventManager:
 event_manager = StorageStatsEventManager()
 
 
+def _build_initial_stats_frame() -> bytes:
+    """Build the initial stats SSE frame from the file monitor (cold-start path)"""
+    from file_monitor import get_file_monitor
+
+    file_monitor = get_file_monitor()
+    current_snapshot = file_monitor.get_current_snapshot()
+
+    # Provide instant stats - don't wait for slow force_check
+    if current_snapshot:
+        if _DEBUG:
+            print("📡 Using cached snapshot for instant SSE response")
+        file_count = current_snapshot.file_count
+        dir_count = current_snapshot.dir_count
+        total_size = current_snapshot.total_size
+        last_modified = current_snapshot.last_modified
+    else:
+        if _DEBUG:
+            print("📡 No snapshot available, providing instant placeholder stats")
+        file_count = 0
+        dir_count = 0
+        total_size = 0
+        last_modified = time.time()
+
+    # Get complete initial storage stats (disk stats are fast)
+    disk_stats = event_manager._get_fast_disk_stats()
+
+    initial_stats = {
+        "type": "storage_stats_update",
+        "timestamp": time.time(),
+        "initial": True,
+        "data": {
+            "file_count": file_count,
+            "dir_count": dir_count,
+            "total_size": total_size,
+            "content_size": total_size,
+            "last_modified": last_modified,
+            "total_space": disk_stats["total_space"],
+            "free_space": disk_stats["free_space"],
+            "used_space": disk_stats["used_space"],
+            "changes": {
+                "files_changed": 0,
+                "dirs_changed": 0,
+                "size_changed": 0,
+            },
+        },
+    }
+
+    if _DEBUG:
+        print(
+            f"📡 Sending instant initial storage stats to new client: files={initial_stats['data']['file_count']}, total_space={initial_stats['data']['total_space']}"
+        )
+    return _sse_frame(initial_stats)
+
+
 def storage_stats_sse():
     """Server-Sent Events endpoint for real-time storage stats - Waitress compatible"""
     from flask import request
@@ -199,80 +254,37 @@ def storage_stats_sse():
 
         try:
             # Send initial connection message with proper SSE format (as bytes for Waitress)
-            yield f"data: {json.dumps({'type': 'connected', 'timestamp': time.time()})}\n\n".encode(
-                "utf-8"
-            )
-
-            # Always send complete initial stats when client connects
-            from file_monitor import get_file_monitor
-
-            file_monitor = get_file_monitor()
-            current_snapshot = file_monitor.get_current_snapshot()
-
-            # Provide instant stats - don't wait for slow force_check
-            if current_snapshot:
-                print("� Using cached snapshot for instant SSE response")
-                file_count = current_snapshot.file_count
-                dir_count = current_snapshot.dir_count
-                total_size = current_snapshot.total_size
-                last_modified = current_snapshot.last_modified
+            yield _sse_frame({"type": "connected", "timestamp": time.time()})
+
+            # Reuse the last broadcast frame when it is fresh — same shape, and
+            # it spares a snapshot read + disk stat on every connection burst.
+            cached = event_manager.get_last_stats()
+            if cached and time.time() - cached["timestamp"] < _INITIAL_STATS_MAX_AGE:
+                initial_stats = {**cached, "initial": True}
+                yield _sse_frame(initial_stats)
             else:
-                print("📡 No snapshot available, providing instant placeholder stats")
-                file_count = 0
-                dir_count = 0
-                total_size = 0
-                last_modified = time.time()
-
-            # Get complete initial storage stats (disk stats are fast)
-            disk_stats = event_manager._get_fast_disk_stats()
-
-            initial_stats = {
-                "type": "storage_stats_update",
-                "timestamp": time.time(),
-                "initial": True,
-                "data": {
-                    "file_count": file_count,
-                    "dir_count": dir_count,
-                    "total_size": total_size,
-                    "content_size": total_size,
-                    "last_modified": last_modified,
-                    "total_space": disk_stats["total_space"],
-                    "free_space": disk_stats["free_space"],
-                    "used_space": disk_stats["used_space"],
-                    "changes": {
-                        "files_changed": 0,
-                        "dirs_changed": 0,
-                        "size_changed": 0,
-                    },
-                },
-            }
-
-            print(
-                f"📡 Sending instant initial storage stats to new client: files={initial_stats['data']['file_count']}, total_space={initial_stats['data']['total_space']}"
-            )
-            yield f"data: {json.dumps(initial_stats)}\n\n".encode("utf-8")
+                yield _build_initial_stats_frame()
 
             # Keep connection alive and send updates
             while True:
                 try:
                     data = client_queue.get(timeout=10)
-                    yield f"data: {json.dumps(data)}\n\n".encode("utf-8")
+                    yield _sse_frame(data)
                 except Empty:
-                    yield f"data: {json.dumps({'type': 'ping', 'timestamp': time.time()})}\n\n".encode(
-                        "utf-8"
-                    )
+                    yield _sse_frame({"type": "ping", "timestamp": time.time()})
                 except Exception as e:
                     print(f"❌ Error in SSE stream: {e}")
                     break
 
         finally:
             event_manager.remove_client(client_queue)
-            print(f"📡 SSE client cleanup completed")
+            if _DEBUG:
+                print(f"📡 SSE client cleanup completed")
 
     # Waitress streams any WSGI iterable chunk-by-chunk as long as:
     # 1. No Content-Length header is set (so it uses chunked transfer encoding)
     # 2. direct_passthrough is NOT set (that's Werkzeug-only and breaks Waitress)
-    # 3. The generator yields bytes (already done above with .encode('utf-8'))
+    # 3. The generator yields bytes (already done above via _sse_frame)
     from flask import Response
 
     response = Response(
@@ -3,6 +3,12 @@
 REQ="requirements.txt"
 CONSTRAINTS="constraints.txt"
 
+# This script calls pip once per package (show / index versions) plus the
+# dry-run and the install. Skip pip's self-update probe (a network round
+# trip on every invocation) and never let pip block on a prompt.
+export PIP_DISABLE_PIP_VERSION_CHECK=1
+export PIP_NO_INPUT=1
+
 # Single source of truth: every package this script touches, including the
 # ones that need special handling on Termux. Exceptions are handled below
 # via lookup tables, not by removing entries from this list -- so the list
@@ -12,21 +12,10 @@ production: a compromised web directory then cannot expose your keys.
 import os
 import sys
 import json
-
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import time
+import importlib
 
 try:
-    import importlib
-    import config
-
-    importlib.reload(config)
-    from config import (
-        detect_platform,
-        PRESET_PATHS,
-        format_bytes,
-        set_preset_path,
-        set_custom_storage_path,
-    )
     from paths import (
         get_db_dir,
         get_cache_dir,
@@ -39,44 +28,163 @@ try:
         reset_hls_cache_dir,
         get_all_paths,
     )
+except ImportError as e:
+    print(f"❌ Import error: {e}")
+    print("Make sure you're running this script from the project directory.")
+    sys.exit(1)
+
+# Bound by _load_config() when the menu starts — importing config runs its
+# storage-directory setup, so it doesn't happen merely on import.
+config = None
+DB_DIR = None
+CACHE_DIR = None
+
+# The platform can't change while the menu runs — _load_config() resolves it
+# (and what depends on it) once instead of on every redraw.
+_PLATFORM = None
+_PRESETS = {}
+_EXAMPLE_PARENTS = ()
+
+# Resolved once — expanduser looks the home directory up (env / pwd) each call
+_HOME = os.path.expanduser("~")
+
+
+def _load_config():
+    global config, DB_DIR, CACHE_DIR, _PLATFORM, _PRESETS, _EXAMPLE_PARENTS
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    try:
+        import config as _config
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+        print("Make sure you're running this script from the project directory.")
+        sys.exit(1)
+    config = _config
 
     # DB_DIR and CACHE_DIR come from paths directly — not from config —
     # so setup_storage.py works even on an older config.py that doesn't
     # export them yet.
     DB_DIR = get_db_dir()
     CACHE_DIR = get_cache_dir()
-except ImportError as e:
-    print(f"❌ Import error: {e}")
-    print("Make sure you're running this script from the project directory.")
-    sys.exit(1)
+
+    _PLATFORM = config.detect_platform()
+    _PRESETS = config.PRESET_PATHS.get(_PLATFORM, {})
+    _EXAMPLE_PARENTS = _example_parents()
+
+
+def _expand_home(path):
+    """os.path.expanduser for the plain `~` / `~/...` case, using the cached home
+    (other forms such as `~user` still go through expanduser)."""
+    if path == "~" or path.startswith(("~/", "~" + os.sep)):
+        return _HOME + path[1:]
+    return os.path.expanduser(path)
+
+
+def _example_parents():
+    home = _HOME
+    if _PLATFORM == "windows":
+        appdata = os.environ.get("APPDATA", os.path.join(home, "AppData", "Roaming"))
+        return (
+            os.path.join(appdata, "CloudinatorFTP"),
+            os.path.join(home, ".cloudinator"),
+        )
+    elif _PLATFORM == "termux":
+        return (
+            os.path.join(home, ".cloudinator"),
+            "/data/data/com.termux/files/home/.cloudinator",
+        )
+    else:
+        return (
+            os.path.join(home, ".cloudinator"),
+            "/etc/cloudinator",
+            "/var/lib/cloudinator",
+        )
+
+
+# (time.monotonic() stamp, [status, ...]) — see _preset_statuses()
+_PRESET_STATUS_TTL = 5.0
+_preset_status_cache = None
+
+# path -> (time.monotonic() stamp, formatted free space) — see _free_space()
+_FREE_SPACE_TTL = 2.0
+_free_space_cache = {}
+
+# Banner + current-config lines for the main menu; None means "re-render".
+# Cleared by _invalidate_path_caches() whenever a path actually changes.
+_frame_cache = None
+
+
+# Set by the first clear_screen() — see _enable_vt_mode()
+_vt_enabled = False
+
+
+def _enable_vt_mode():
+    # Windows 10+ consoles only interpret ANSI escapes once VT processing is
+    # switched on. SetConsoleMode does that directly — no cmd.exe spawn, and
+    # nothing happens merely because the module was imported.
+    global _vt_enabled
+    _vt_enabled = True
+    if os.name != "nt":
+        return
+    try:
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_ulong()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+            kernel32.SetConsoleMode(handle, mode.value | 0x0004)
+    except (ImportError, AttributeError, OSError):
+        pass
 
 
 def clear_screen():
-    os.system("cls" if os.name == "nt" else "clear")
+    # Cursor home + erase display — same effect as `clear`/`cls` without
+    # spawning a shell on every redraw. Skipped when output is redirected.
+    if sys.stdout.isatty():
+        if not _vt_enabled:
+            _enable_vt_mode()
+        sys.stdout.write("\x1b[H\x1b[2J")
+        sys.stdout.flush()
+
+
+def _emit(lines):
+    """Write a block of menu lines with a single write instead of one per print()"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+def _banner_lines():
+    return [
+        "=" * 60,
+        "🚀 CLOUDINATOR FTP — STORAGE SETUP",
+        "=" * 60,
+        "",
+    ]
 
 
 def print_banner():
-    print("=" * 60)
-    print("🚀 CLOUDINATOR FTP — STORAGE SETUP")
-    print("=" * 60)
-    print()
+    _emit(_banner_lines())
 
 
 def _get_choice(max_choice):
+    # Every valid answer is known up front — a dict lookup replaces int()
+    # and the ValueError round-trip on bad input.
+    valid = {str(i): i for i in range(max_choice + 1)}
     while True:
         try:
             raw = input(f"Select option (1-{max_choice}, 0 to cancel): ").strip()
-            if raw == "0":
-                return 0
-            n = int(raw)
-            if 1 <= n <= max_choice:
-                return n
-            print(f"❌ Enter a number between 1 and {max_choice}")
-        except ValueError:
-            print("❌ Please enter a valid number")
         except KeyboardInterrupt:
             print("\n👋 Cancelled")
             return 0
+        n = valid.get(raw)
+        if n is not None:
+            return n
+        if raw.isdigit():
+            print(f"❌ Enter a number between 1 and {max_choice}")
+        else:
+            print("❌ Please enter a valid number")
 
 
 def _confirm_path(final_path: str, label: str) -> bool:
@@ -99,19 +207,26 @@ def _confirm_path(final_path: str, label: str) -> bool:
 
 
 def _check_path(path):
+    # A real write probe, not access(W_OK): that ignores Windows ACLs and is
+    # unreliable on Android FUSE mounts. On Linux the probe is one O_TMPFILE
+    # open that leaves nothing behind.
     if not os.path.exists(path):
         return False, False
     try:
-        test = os.path.join(path, ".write_test")
-        with open(test, "w") as f:
-            f.write("test")
-        os.remove(test)
+        config.probe_write(path)
         return True, True
-    except Exception:
+    except OSError:
         return True, False
 
 
 def _free_space(path):
+    # Free space moves slowly next to menu navigation — reuse a reading for
+    # _FREE_SPACE_TTL seconds instead of re-querying on every redraw.
+    now = time.monotonic()
+    hit = _free_space_cache.get(path)
+    if hit and now - hit[0] < _FREE_SPACE_TTL:
+        return hit[1]
+
     try:
         if os.name == "nt":
             import shutil
@@ -120,18 +235,20 @@ def _free_space(path):
         else:
             st = os.statvfs(path)
             free = st.f_bavail * st.f_frsize
-        return format_bytes(free)
-    except Exception:
-        return "Unknown"
+        result = config.format_bytes(free)
+    except OSError:
+        result = "Unknown"
 
+    _free_space_cache[path] = (now, result)
+    return result
 
-def print_current_config():
+
+def _current_config_lines():
     importlib.reload(config)
     paths = get_all_paths()
     server_root = os.path.dirname(os.path.abspath(__file__))
 
-    print("📋 Current Configuration:")
-    print()
+    lines = ["📋 Current Configuration:", ""]
 
     rows = [
         ("Files   (ROOT_DIR) ", config.ROOT_DIR, "🗂️ "),
@@ -148,12 +265,18 @@ def print_current_config():
             if os.path.abspath(path).startswith(os.path.abspath(server_root))
             else " ✅ outside server root"
         )
-        print(f"  {icon}  {label}")
-        print(f"      {status} {path}")
-        print(f"         {inside}")
+        lines.append(f"  {icon}  {label}")
+        lines.append(f"      {status} {path}")
+        lines.append(f"         {inside}")
         if exists:
-            print(f"         Free space: {_free_space(path)}")
-        print()
+            lines.append(f"         Free space: {_free_space(path)}")
+        lines.append("")
+
+    return lines
+
+
+def print_current_config():
+    _emit(_current_config_lines())
 
 
 # ---------------------------------------------------------------------------
@@ -161,44 +284,104 @@ def print_current_config():
 # ---------------------------------------------------------------------------
 
 
-def show_preset_options():
-    platform_type = detect_platform()
-    if platform_type not in PRESET_PATHS:
-        print(f"❌ No preset paths available for {platform_type}")
-        return []
+def _existing_dirs(paths):
+    """Return the subset of `paths` that are existing directories.
 
-    presets = PRESET_PATHS[platform_type]
-    print(f"📍 Available File Storage Locations for {platform_type.title()}:")
-    print("-" * 50)
+    Presets mostly share a parent (~/Desktop, ~/Documents, ~/Downloads), so
+    each shared parent is listed once instead of stat-ing every path.
+    """
+    by_parent = {}
+    for p in paths:
+        by_parent.setdefault(os.path.dirname(p), []).append(p)
 
-    options = []
-    for i, (key, path) in enumerate(presets.items(), 1):
+    found = set()
+    for parent, children in by_parent.items():
+        try:
+            with os.scandir(parent) as it:
+                names = {os.path.normcase(e.name) for e in it if e.is_dir()}
+        except OSError:
+            # Parent not listable (e.g. /storage/emulated on Android) — probe each
+            found.update(p for p in children if os.path.isdir(p))
+            continue
+        found.update(
+            p for p in children if os.path.normcase(os.path.basename(p)) in names
+        )
+    return found
+
+
+_PRESET_DESCRIPTIONS = {
+    "downloads": "Recommended for easy access",
+    "documents": "Good for document storage",
+    "desktop": "Quick access from desktop",
+    "internal": "Android internal storage root",
+    "dcim": "Camera/media folder",
+    "termux_home": "Termux app directory only",
+}
+
+
+def _preset_statuses():
+    """Status emoji per preset, in _PRESETS order — reused for a few seconds so
+    paging back and forth through the menu doesn't re-probe every parent."""
+    global _preset_status_cache
+    now = time.monotonic()
+    if _preset_status_cache and now - _preset_status_cache[0] < _PRESET_STATUS_TTL:
+        return _preset_status_cache[1]
+
+    # Loop-invariant lookups bound once rather than resolved per preset
+    dirname, access, W_OK = os.path.dirname, os.access, os.W_OK
+
+    parents = [dirname(p) for p in _PRESETS.values()]
+    existing = _existing_dirs(parents)
+
+    statuses = []
+    append = statuses.append
+    for parent in parents:
         try:
-            parent = os.path.dirname(path)
-            status = (
-                "✅"
-                if os.path.exists(parent) and os.access(parent, os.W_OK)
-                else ("⚠️ " if os.path.exists(parent) else "❌")
-            )
-        except Exception:
+            if parent in existing:
+                status = "✅" if access(parent, W_OK) else "⚠️ "
+            else:
+                status = "❌"
+        except OSError:
             status = "❌"
+        append(status)
+
+    _preset_status_cache = (now, statuses)
+    return statuses
+
+
+def _invalidate_path_caches():
+    """Drop cached preset statuses, free-space readings and the rendered menu
+    frame after a path change"""
+    global _preset_status_cache, _frame_cache
+    _preset_status_cache = None
+    _frame_cache = None
+    _free_space_cache.clear()
+
 
-        print(f"{i:2d}. {status} {key.replace('_', ' ').title()}")
-        print(f"      {path}")
+def show_preset_options():
+    if not _PRESETS:
+        print(f"❌ No preset paths available for {_PLATFORM}")
+        return []
+
+    lines = [
+        f"📍 Available File Storage Locations for {_PLATFORM.title()}:",
+        "-" * 50,
+    ]
+
+    statuses = _preset_statuses()
+
+    options = []
+    for i, ((key, path), status) in enumerate(zip(_PRESETS.items(), statuses), 1):
+        lines.append(f"{i:2d}. {status} {key.replace('_', ' ').title()}")
+        lines.append(f"      {path}")
         options.append((key, path))
 
-        descs = {
-            "downloads": "Recommended for easy access",
-            "documents": "Good for document storage",
-            "desktop": "Quick access from desktop",
-            "internal": "Android internal storage root",
-            "dcim": "Camera/media folder",
-            "termux_home": "Termux app directory only",
-        }
-        if key in descs:
-            print(f"      💡 {descs[key]}")
-        print()
+        desc = _PRESET_DESCRIPTIONS.get(key)
+        if desc:
+            lines.append(f"      💡 {desc}")
+        lines.append("")
 
+    _emit(lines)
     return options
 
 
@@ -225,8 +408,9 @@ def configure_files_path():
         key, path = options[choice - 1]
         if not _confirm_path(path, "Files storage"):
             return
-        if set_preset_path(key):
-            importlib.reload(config)
+        # set_custom_storage_path rebinds config.ROOT_DIR itself — no reload
+        if config.set_preset_path(key):
+            _invalidate_path_caches()
             print(f"✅ Files storage set to: {path}")
 
 
@@ -237,11 +421,11 @@ def _configure_custom_files_path():
         custom = input("Path: ").strip()
         if not custom:
             return
-        expanded = os.path.abspath(os.path.expanduser(custom))
+        expanded = os.path.abspath(_expand_home(custom))
         if not _confirm_path(expanded, "Files storage"):
             return
-        if set_custom_storage_path(expanded, use_subfolder=False):
-            importlib.reload(config)
+        if config.set_custom_storage_path(expanded, use_subfolder=False):
+            _invalidate_path_caches()
             print(f"✅ Files storage set to: {expanded}")
     except KeyboardInterrupt:
         print("\n👋 Cancelled")
@@ -253,8 +437,6 @@ def _configure_custom_files_path():
 
 
 def _db_cache_examples(kind):
-    home = os.path.expanduser("~")
-    platform_type = detect_platform()
     if kind == "db":
         subfolder = "cloudinator_db"
     elif kind == "cache":
@@ -262,23 +444,7 @@ def _db_cache_examples(kind):
     else:  # hls
         subfolder = "cloudinator_hls"
 
-    if platform_type == "windows":
-        appdata = os.environ.get("APPDATA", os.path.join(home, "AppData", "Roaming"))
-        return [
-            os.path.join(appdata, "CloudinatorFTP", subfolder),
-            os.path.join(home, ".cloudinator", subfolder),
-        ]
-    elif platform_type == "termux":
-        return [
-            os.path.join(home, ".cloudinator", subfolder),
-            f"/data/data/com.termux/files/home/.cloudinator/{subfolder}",
-        ]
-    else:
-        return [
-            os.path.join(home, ".cloudinator", subfolder),
-            f"/etc/cloudinator/{subfolder}",
-            f"/var/lib/cloudinator/{subfolder}",
-        ]
+    return [os.path.join(parent, subfolder) for parent in _EXAMPLE_PARENTS]
 
 
 def _pick_suggested_path(kind, examples):
@@ -302,11 +468,13 @@ def _pick_suggested_path(kind, examples):
     if not _confirm_path(path, label):
         return
     if kind == "db":
-        set_db_dir(path)
+        changed = set_db_dir(path)
     elif kind == "cache":
-        set_cache_dir(path)
+        changed = set_cache_dir(path)
     else:
-        set_hls_cache_dir(path)
+        changed = set_hls_cache_dir(path)
+    if changed:
+        _invalidate_path_caches()
 
 
 def _configure_custom_dir(kind):
@@ -319,7 +487,7 @@ def _configure_custom_dir(kind):
         custom = input("Path: ").strip()
         if not custom:
             return
-        expanded = os.path.abspath(os.path.expanduser(custom))
+        expanded = os.path.abspath(_expand_home(custom))
         if os.path.basename(expanded).lower() != subfolder:
             final = os.path.join(expanded, subfolder)
         else:
@@ -327,11 +495,13 @@ def _configure_custom_dir(kind):
         if not _confirm_path(final, label):
             return
         if kind == "db":
-            set_db_dir(expanded)
+            changed = set_db_dir(expanded)
         elif kind == "cache":
-            set_cache_dir(expanded)
+            changed = set_cache_dir(expanded)
         else:
-            set_hls_cache_dir(expanded)
+            changed = set_hls_cache_dir(expanded)
+        if changed:
+            _invalidate_path_caches()
     except KeyboardInterrupt:
         print("\n👋 Cancelled")
 
@@ -375,6 +545,7 @@ def configure_db_path():
         _configure_custom_dir("db")
     elif choice == 3:
         reset_db_dir()
+        _invalidate_path_caches()
 
 
 # ---------------------------------------------------------------------------
@@ -417,6 +588,7 @@ def configure_cache_path():
         _configure_custom_dir("cache")
     elif choice == 3:
         reset_cache_dir()
+        _invalidate_path_caches()
 
 
 # ---------------------------------------------------------------------------
@@ -460,22 +632,31 @@ def configure_hls_cache_path():
         _configure_custom_dir("hls")
     elif choice == 3:
         reset_hls_cache_dir()
+        _invalidate_path_caches()
 
 
 def main_menu():
+    global _frame_cache
     while True:
         clear_screen()
-        print_banner()
-        print_current_config()
-
-        print("🔧 Configuration Options:")
-        print("1. 🗂️  Configure Files storage path   (ROOT_DIR)")
-        print("2. 🔐 Configure Database directory    (DB_DIR)  ← keys & secrets")
-        print("3. ⚡ Configure Cache directory       (CACHE_DIR)")
-        print("4. 🎬 Configure HLS Cache directory   (HLS_CACHE_DIR)")
-        print("5. 📋 Refresh current settings")
-        print("6. ❌ Exit")
-        print()
+        # Re-probe the filesystem only when something changed (or the user
+        # asked to refresh); otherwise redraw the previous frame as-is.
+        if _frame_cache is None:
+            _frame_cache = _banner_lines() + _current_config_lines()
+
+        _emit(
+            _frame_cache
+            + [
+                "🔧 Configuration Options:",
+                "1. 🗂️  Configure Files storage path   (ROOT_DIR)",
+                "2. 🔐 Configure Database directory    (DB_DIR)  ← keys & secrets",
+                "3. ⚡ Configure Cache directory       (CACHE_DIR)",
+                "4. 🎬 Configure HLS Cache directory   (HLS_CACHE_DIR)",
+                "5. 📋 Refresh current settings",
+                "6. ❌ Exit",
+                "",
+            ]
+        )
 
         choice = _get_choice(6)
 
@@ -495,7 +676,7 @@ def main_menu():
             configure_hls_cache_path()
             input("\nPress Enter to continue...")
         elif choice == 5:
-            pass  # loop re-prints print_current_config
+            _invalidate_path_caches()  # next loop re-renders from scratch
 
 
 def main():
@@ -508,6 +689,7 @@ def main():
             print("Run this script from the project directory.")
             return 1
 
+        _load_config()
         main_menu()
         print("\n🎯 Setup Complete!")
         return 0
@@ -13,7 +13,7 @@ if exist "venv\Scripts\activate.bat" (
 
 REM Install/update dependencies
 echo Installing dependencies...
-pip install -r requirements.txt
+pip install --disable-pip-version-check --no-input -r requirements.txt
 
 REM Start the development server
 echo.
@@ -12,7 +12,7 @@ fi
 
 # Install/update dependencies
 echo "Installing dependencies..."
-pip install -r requirements.txt
+pip install --disable-pip-version-check --no-input -r requirements.txt
 
 # Start the production server
 echo
@@ -1,10 +1,19 @@
 import os
+import sys
+import errno
 import shutil
 import time
 import threading
 import stat
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from operator import itemgetter
 from config import ROOT_DIR, CHUNK_SIZE
 
+# Evaluated once — checked on every chunk save, assembly and delete
+_IS_WIN = os.name == "nt"
+_CHMOD_RW = stat.S_IWRITE | stat.S_IREAD
+
 
 # Lazy import to avoid circular imports at module load time.
 # file_index_manager is used in list_dir() for large-folder cache hits.
@@ -17,6 +26,20 @@ def _get_file_index_manager():
         return None
 
 
+# file_monitor pulls in watchdog and builds its singleton on import, so it's
+# imported lazily too — but only once, not on every get_dir_info() call.
+_file_monitor = None
+
+
+def _get_file_monitor():
+    global _file_monitor
+    if _file_monitor is None:
+        from file_monitor import get_file_monitor
+
+        _file_monitor = get_file_monitor()
+    return _file_monitor
+
+
 def ensure_root():
     if not os.path.exists(ROOT_DIR):
         os.makedirs(ROOT_DIR)
@@ -34,37 +57,83 @@ def windows_remove_readonly(func, path, _):
         func(path)
 
 
-def safe_rmtree(path):
+# Windows and Unix-like variants of the delete/chmod helpers are picked once
+# at import (see below) rather than branching on the platform per call.
+
+
+def _safe_rmtree_win(path):
     """
     Safely remove a directory tree, handling Windows read-only files
     """
     try:
-        if os.name == "nt":  # Windows
-            shutil.rmtree(path, onerror=windows_remove_readonly)
-        else:  # Unix-like systems
-            shutil.rmtree(path)
+        shutil.rmtree(path, onerror=windows_remove_readonly)
         return True
     except Exception as e:
         print(f"❌ Error removing directory {path}: {e}")
         return False
 
 
-def safe_remove_file(file_path):
+def _safe_rmtree_posix(path):
+    """
+    Safely remove a directory tree
+    """
+    try:
+        shutil.rmtree(path)
+        return True
+    except Exception as e:
+        print(f"❌ Error removing directory {path}: {e}")
+        return False
+
+
+def _safe_remove_file_win(file_path):
     """
     Safely remove a single file, handling Windows read-only files
     """
     try:
-        if os.path.exists(file_path):
-            if os.name == "nt":  # Windows
-                # Make sure file is writable before deletion
-                os.chmod(file_path, stat.S_IWRITE)
-            os.remove(file_path)
+        # Make sure file is writable before deletion
+        os.chmod(file_path, stat.S_IWRITE)
+        os.remove(file_path)
         return True
+    except FileNotFoundError:
+        return True  # already gone — same outcome as removing it
     except Exception as e:
         print(f"❌ Error removing file {file_path}: {e}")
         return False
 
 
+def _safe_remove_file_posix(file_path):
+    """
+    Safely remove a single file
+    """
+    try:
+        os.remove(file_path)
+        return True
+    except FileNotFoundError:
+        return True  # already gone — same outcome as removing it
+    except Exception as e:
+        print(f"❌ Error removing file {file_path}: {e}")
+        return False
+
+
+def _ensure_rw_win(path):
+    """Make sure a file we just wrote stays writable (important for Windows)"""
+    os.chmod(path, _CHMOD_RW)
+
+
+def _ensure_rw_posix(path):
+    pass  # files are created writable by their owner; nothing to fix up
+
+
+if _IS_WIN:
+    safe_rmtree = _safe_rmtree_win
+    safe_remove_file = _safe_remove_file_win
+    _ensure_rw = _ensure_rw_win
+else:
+    safe_rmtree = _safe_rmtree_posix
+    safe_remove_file = _safe_remove_file_posix
+    _ensure_rw = _ensure_rw_posix
+
+
 def list_dir(path):
     full_path = os.path.join(ROOT_DIR, path)
     if not os.path.exists(full_path):
@@ -103,7 +172,9 @@ def list_dir(path):
     # ── Slow path: live os.scandir() ───────────────────────────────────────
     # Used when the folder is below the cache threshold (≤80 entries) or
     # when the cache hasn't been populated yet (first boot before walk).
-    items = []
+
+    # (sort key, item) pairs — the key is built once during the scan
+    keyed = []
     try:
         with os.scandir(full_path) as it:
             for entry in it:
@@ -111,10 +182,12 @@ def list_dir(path):
                 if entry.name.startswith("."):
                     continue
 
+                is_dir = entry.is_dir()
+                sort_key = (not is_dir, entry.name.lower())
                 try:
                     stat = entry.stat()
 
-                    if entry.is_dir():
+                    if is_dir:
                         # Never recursively walk directories on listing —
                         # that caused 8+ second page loads with large file trees.
                         # Size and item_count are returned as None and rendered
@@ -127,31 +200,37 @@ def list_dir(path):
                         size = stat.st_size
                         item_count = None
 
-                    items.append(
-                        {
-                            "name": entry.name,
-                            "is_dir": entry.is_dir(),
-                            "size": size,
-                            "item_count": item_count,
-                            "modified": stat.st_mtime,
-                        }
+                    keyed.append(
+                        (
+                            sort_key,
+                            {
+                                "name": entry.name,
+                                "is_dir": is_dir,
+                                "size": size,
+                                "item_count": item_count,
+                                "modified": stat.st_mtime,
+                            },
+                        )
                     )
                 except (OSError, IOError):
-                    items.append(
-                        {
-                            "name": entry.name,
-                            "is_dir": entry.is_dir(),
-                            "size": None,
-                            "item_count": None,
-                            "modified": None,
-                        }
+                    keyed.append(
+                        (
+                            sort_key,
+                            {
+                                "name": entry.name,
+                                "is_dir": is_dir,
+                                "size": None,
+                                "item_count": None,
+                                "modified": None,
+                            },
+                        )
                     )
 
         # Sort: directories first, then files, both alphabetically
-        items.sort(key=lambda x: (not x["is_dir"], x["name"].lower()))
+        keyed.sort(key=itemgetter(0))
     except (OSError, PermissionError):
         return []
-    return items
+    return [item for _, item in keyed]
 
 
 def count_directory_items(path):
@@ -161,14 +240,15 @@ def count_directory_items(path):
         file_count = 0
         dir_count = 0
 
-        for item in os.listdir(full_path):
-            if item.startswith("."):
-                continue
-            item_path = os.path.join(full_path, item)
-            if os.path.isdir(item_path):
-                dir_count += 1
-            else:
-                file_count += 1
+        # DirEntry carries the type from readdir — no per-entry stat
+        with os.scandir(full_path) as it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    dir_count += 1
+                else:
+                    file_count += 1
 
         return {"files": file_count, "dirs": dir_count}
     except (OSError, IOError):
@@ -184,17 +264,17 @@ def save_chunk(file_id, chunk_num, chunk_data):
             f.write(chunk_data)
 
         # Ensure the chunk file is writable (important for Windows)
-        if os.name == "nt":
-            os.chmod(chunk_path, stat.S_IWRITE | stat.S_IREAD)
+        _ensure_rw(chunk_path)
 
-        # Update timestamp for cleanup tracking
-        timestamp_file = os.path.join(tmp_dir, ".timestamp")
-        with open(timestamp_file, "w") as f:
-            f.write(str(time.time()))
-
-        # Ensure timestamp file is also writable
-        if os.name == "nt":
-            os.chmod(timestamp_file, stat.S_IWRITE | stat.S_IREAD)
+        # Bump the chunk directory's mtime for cleanup tracking — one utime
+        # instead of rewriting (and chmod-ing) a .timestamp file per chunk.
+        # Creating a new chunk already does this, but a retried chunk that
+        # overwrites an existing file wouldn't. Some Android FUSE mounts
+        # refuse utime; the chunk itself is saved either way.
+        try:
+            os.utime(tmp_dir, None)
+        except OSError:
+            pass
 
         return True
     except (OSError, IOError) as e:
@@ -202,25 +282,43 @@ def save_chunk(file_id, chunk_num, chunk_data):
         return False
 
 
+# Above this many chunks the per-chunk stat + access() checks are spread over
+# a thread pool — on network/FUSE storage each one is a round trip, and doing
+# thousands back to back dominates verification time.
+_PARALLEL_STAT_MIN_CHUNKS = 256
+_STAT_WORKERS = 32
+
+
+def _chunk_stat(entry):
+    """(size, readable, error) for one chunk DirEntry"""
+    try:
+        size = entry.stat(follow_symlinks=False).st_size
+        return size, os.access(entry.path, os.R_OK), None
+    except OSError as e:
+        return None, False, e
+
+
 def verify_chunks_complete(file_id, expected_chunks=None):
     """Verify all chunks exist and map them for assembly"""
     tmp_dir = os.path.join(ROOT_DIR, ".chunks", file_id)
 
-    if not os.path.exists(tmp_dir):
+    # One scandir pass finds every chunk (metadata files are skipped by
+    # name); DirEntry already knows the type, so there's no separate
+    # isfile/exists round trip per chunk afterwards.
+    entries = {}
+    try:
+        with os.scandir(tmp_dir) as it:
+            for entry in it:
+                if entry.name.isdigit() and entry.is_file(follow_symlinks=False):
+                    entries[int(entry.name)] = entry
+    except FileNotFoundError:
         raise FileNotFoundError(f"Chunk directory not found for {file_id}")
 
-    # Get all chunk files (exclude metadata files)
-    chunk_files = [
-        f
-        for f in os.listdir(tmp_dir)
-        if f.isdigit() and os.path.isfile(os.path.join(tmp_dir, f))
-    ]
-
-    if not chunk_files:
+    if not entries:
         raise FileNotFoundError(f"No chunk files found for {file_id}")
 
     # Sort chunks numerically
-    chunk_nums = sorted([int(f) for f in chunk_files])
+    chunk_nums = sorted(entries)
     total_chunks = len(chunk_nums)
 
     # If expected chunks is provided, verify count
@@ -240,33 +338,26 @@ def verify_chunks_complete(file_id, expected_chunks=None):
         raise ValueError(error_msg)
 
     # Create chunk map with file paths and verify each chunk exists and is readable
+    ordered = [entries[i] for i in range(total_chunks)]
+    if total_chunks >= _PARALLEL_STAT_MIN_CHUNKS:
+        with ThreadPoolExecutor(max_workers=_STAT_WORKERS) as pool:
+            stats = list(pool.map(_chunk_stat, ordered))
+    else:
+        stats = [_chunk_stat(entry) for entry in ordered]
+
     chunk_map = {}
     total_size = 0
 
-    for i in range(total_chunks):
-        chunk_path = os.path.join(tmp_dir, str(i))
-
-        if not os.path.exists(chunk_path):
-            raise FileNotFoundError(f"Chunk {i} file not found at {chunk_path}")
+    for i, (chunk_size, readable, error) in enumerate(stats):
+        if error is not None:
+            raise IOError(f"Cannot read chunk {i}: {error}")
+        if chunk_size == 0:
+            raise ValueError(f"Chunk {i} is empty")
+        if not readable:
+            raise IOError(f"Cannot read chunk {i}: permission denied")
+        total_size += chunk_size
 
-        if not os.path.isfile(chunk_path):
-            raise ValueError(f"Chunk {i} is not a file: {chunk_path}")
-
-        # Check if chunk is readable and get size
-        try:
-            chunk_size = os.path.getsize(chunk_path)
-            if chunk_size == 0:
-                raise ValueError(f"Chunk {i} is empty")
-            total_size += chunk_size
-
-            # Test read access
-            with open(chunk_path, "rb") as test_file:
-                test_file.read(1)  # Read one byte to verify access
-
-        except (OSError, IOError) as e:
-            raise IOError(f"Cannot read chunk {i}: {e}")
-
-        chunk_map[i] = {"path": chunk_path, "size": chunk_size}
+        chunk_map[i] = {"path": ordered[i].path, "size": chunk_size}
 
     print(
         f"✅ Chunk verification complete for {file_id}: {total_chunks} chunks, {total_size} bytes total"
@@ -279,6 +370,198 @@ def verify_chunks_complete(file_id, expected_chunks=None):
     }
 
 
+# Kernel-side copy tiers for assembly, best first. copy_file_range() can
+# reflink on CoW filesystems (Btrfs, XFS) and otherwise copies in-kernel;
+# Linux sendfile() also accepts a regular file as the destination. Both are
+# switched off for the process the first time a filesystem refuses them.
+# Elsewhere (Windows, macOS) a reusable readinto() buffer does the copy.
+_USE_COPY_FILE_RANGE = hasattr(os, "copy_file_range")
+_USE_SENDFILE = sys.platform.startswith("linux") and hasattr(os, "sendfile")
+
+# Buffer size for the readinto() fallback — one buffer per assembly, reused
+# for every chunk instead of a fresh bytes object per read.
+_COPY_BUFSIZE = 1024 * 1024
+
+
+def _copy_chunk(infile, outfile, size, buf):
+    """Append up to size bytes of infile to outfile; returns bytes copied.
+    buf is a writable memoryview reused across chunks by the fallback path."""
+    global _USE_COPY_FILE_RANGE, _USE_SENDFILE
+    if _USE_COPY_FILE_RANGE or _USE_SENDFILE:
+        outfile.flush()
+        out_fd, in_fd = outfile.fileno(), infile.fileno()
+
+    if _USE_COPY_FILE_RANGE:
+        copied = 0
+        try:
+            while copied < size:
+                # offset_dst left unset: writes at (and advances) outfile's position
+                n = os.copy_file_range(in_fd, out_fd, size - copied, copied)
+                if n == 0:
+                    break  # chunk is shorter than recorded
+                copied += n
+            if copied or not size:
+                return copied
+            # 0 bytes on the very first call: some virtual filesystems
+            # report "nothing copied" instead of an error — try the next tier
+            _USE_COPY_FILE_RANGE = False
+        except OSError:
+            if copied:
+                raise
+            # EXDEV on older kernels, EOPNOTSUPP/EINVAL on some FUSE mounts
+            _USE_COPY_FILE_RANGE = False
+
+    if _USE_SENDFILE:
+        copied = 0
+        try:
+            while copied < size:
+                sent = os.sendfile(out_fd, in_fd, copied, size - copied)
+                if sent == 0:
+                    break  # chunk is shorter than recorded
+                copied += sent
+            return copied
+        except OSError:
+            if copied:
+                raise
+            # Some filesystems (FUSE, network mounts) refuse sendfile —
+            # stop trying and use the buffered path from now on
+            _USE_SENDFILE = False
+
+    copied = 0
+    bufsize = len(buf)
+    while copied < size:
+        n = infile.readinto(buf[: min(bufsize, size - copied)])
+        if not n:
+            break  # chunk is shorter than recorded
+        outfile.write(buf[:n])
+        copied += n
+    return copied
+
+
+# Whole-file copies for copy_item(). CopyFileExW keeps the bytes in the
+# kernel on Windows (server-side on SMB shares); elsewhere copy_file_range()
+# is tried first, since shutil only knows sendfile(). Either way copy2() is
+# the fallback and the source of error messages. copy_item() has its own
+# copy_file_range switch: a failure between two mounts here says nothing
+# about chunk assembly, which stays within .chunks' filesystem.
+_FAST_COPY_RANGE = hasattr(os, "copy_file_range")
+_CopyFileExW = None
+if _IS_WIN:
+    try:
+        import ctypes
+
+        _CopyFileExW = ctypes.windll.kernel32.CopyFileExW
+    except (ImportError, AttributeError, OSError):
+        pass
+
+
+def _fast_copy(src, dst):
+    """shutil.copy2() stand-in for copy_item(), also copytree's copy_function"""
+    global _FAST_COPY_RANGE
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    # copy2's contract: copying a file onto itself (or a link to it) is an
+    # error, not a truncation — open(dst, "wb") below would empty it
+    try:
+        same = os.path.samefile(src, dst)
+    except OSError:
+        same = False  # dst doesn't exist yet; src errors surface below
+    if same:
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+
+    if _CopyFileExW is not None:
+        # Copies attributes and mtime too; on failure copy2() raises properly
+        if _CopyFileExW(src, dst, None, None, None, 0):
+            return dst
+    elif _FAST_COPY_RANGE:
+        copied = 0
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+                while True:
+                    n = os.copy_file_range(in_fd, out_fd, 1 << 30)
+                    if n == 0:
+                        break
+                    copied += n
+                size = os.fstat(in_fd).st_size
+            if copied or not size:
+                shutil.copystat(src, dst)
+                return dst
+            # 0 bytes for a non-empty file: the filesystem silently refused
+            _FAST_COPY_RANGE = False
+        except OSError as e:
+            if copied:
+                raise
+            # EXDEV only describes this src/dst pair — fall back for this
+            # call. Unsupported on this kernel/filesystem: stop trying.
+            if e.errno in (errno.EOPNOTSUPP, errno.EINVAL, errno.ENOSYS):
+                _FAST_COPY_RANGE = False
+
+    return shutil.copy2(src, dst)
+
+
+# Page-cache hints for assembly: chunks and the output are streamed once
+# front to back, and the assembled file is rarely read straight away, so it
+# shouldn't push genuinely hot pages out. None where posix_fadvise is missing.
+_FADV_SEQUENTIAL = getattr(os, "POSIX_FADV_SEQUENTIAL", None)
+_FADV_DONTNEED = getattr(os, "POSIX_FADV_DONTNEED", None)
+
+
+def _fadvise(f, advice):
+    """Best-effort posix_fadvise over the whole file; a no-op if unsupported"""
+    if advice is None:
+        return
+    try:
+        os.posix_fadvise(f.fileno(), 0, 0, advice)
+    except OSError:
+        pass
+
+
+# fallocate(2) itself, not os.posix_fallocate: where the filesystem can't
+# preallocate (vfat/exFAT, NFSv3, ext3) glibc emulates posix_fallocate by
+# writing into every block — a full extra pass over a multi-GB upload. The
+# syscall fails fast with EOPNOTSUPP instead. fallocate64 takes 64-bit
+# offsets on 32-bit ARM (Termux) too.
+_fallocate = None
+if sys.platform.startswith("linux"):
+    try:
+        import ctypes
+
+        _libc = ctypes.CDLL(None, use_errno=True)
+        _fallocate = getattr(_libc, "fallocate64", None) or _libc.fallocate
+        _fallocate.argtypes = (
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int64,
+            ctypes.c_int64,
+        )
+        _fallocate.restype = ctypes.c_int
+    except (ImportError, AttributeError, OSError):
+        _fallocate = None
+
+
+def _preallocate(f, size):
+    """
+    Reserve size bytes for f up front so the filesystem can allocate the
+    file in one go instead of extent by extent as chunks are appended.
+    Only done where it's cheap: Linux fallocate(2), which filesystems without
+    support refuse outright, and SetEndOfFile on Windows. Elsewhere, or when
+    refused, the file simply grows as chunks are appended.
+    """
+    if size <= 0:
+        return
+    try:
+        if _IS_WIN:
+            # FileIO.truncate extends through SetEndOfFile on Windows
+            f.truncate(size)
+        elif _fallocate is not None:
+            # Mode 0 allocates and extends st_size; a -1 return (EOPNOTSUPP
+            # and friends) just means no preallocation
+            _fallocate(f.fileno(), 0, 0, size)
+    except OSError:
+        pass
+
+
 def assemble_chunks(file_id, filename, dest_path=""):
     """Enhanced chunk assembly with pre-verification and protection"""
     print(f"🔨 Starting assembly for {filename} (ID: {file_id})")
@@ -311,7 +594,10 @@ def assemble_chunks(file_id, filename, dest_path=""):
         # Step 3: Perform assembly using verified chunk map
         print(f"🔧 Assembling {total_chunks} chunks into {target_path}")
 
+        buf = memoryview(bytearray(_COPY_BUFSIZE))
         with open(target_path, "wb") as outfile:
+            _preallocate(outfile, chunk_info["total_size"])
+            _fadvise(outfile, _FADV_SEQUENTIAL)
             for i in range(total_chunks):
                 chunk_info_item = chunk_map[i]
                 chunk_path = chunk_info_item["path"]
@@ -321,27 +607,32 @@ def assemble_chunks(file_id, filename, dest_path=""):
 
                 try:
                     with open(chunk_path, "rb") as infile:
-                        chunk_data = infile.read()
-                        if len(chunk_data) != chunk_size:
+                        _fadvise(infile, _FADV_SEQUENTIAL)
+                        copied = _copy_chunk(infile, outfile, chunk_size, buf)
+                        if copied != chunk_size:
                             raise IOError(
-                                f"Chunk {i} size mismatch: expected {chunk_size}, got {len(chunk_data)}"
+                                f"Chunk {i} size mismatch: expected {chunk_size}, got {copied}"
                             )
-                        outfile.write(chunk_data)
                 except Exception as e:
                     raise IOError(f"Failed to read chunk {i}: {e}")
 
-        # Step 4: Verify final file
-        final_size = os.path.getsize(target_path)
-        expected_size = chunk_info["total_size"]
+            # Release whatever of the output has already been written back
+            outfile.flush()
+            _fadvise(outfile, _FADV_DONTNEED)
 
-        if final_size != expected_size:
-            raise ValueError(
-                f"Final file size mismatch: expected {expected_size}, got {final_size}"
-            )
+            # Step 4: Verify final file. Each chunk's byte count was checked
+            # above; this catches a copy tier writing past the (possibly
+            # preallocated) end, so it reads the real size from the open fd.
+            final_size = os.fstat(outfile.fileno()).st_size
+            expected_size = chunk_info["total_size"]
+
+            if final_size != expected_size:
+                raise ValueError(
+                    f"Final file size mismatch: expected {expected_size}, got {final_size}"
+                )
 
         # Ensure the final file is writable
-        if os.name == "nt":
-            os.chmod(target_path, stat.S_IWRITE | stat.S_IREAD)
+        _ensure_rw(target_path)
 
         print(f"✅ Assembly successful: {filename} ({final_size} bytes)")
 
@@ -352,6 +643,7 @@ def assemble_chunks(file_id, filename, dest_path=""):
         except Exception as e:
             print(f"⚠️ Warning: Could not remove protection file: {e}")
 
+        invalidate_storage_stats()
         cleanup_chunks(file_id)
         return True
 
@@ -372,6 +664,13 @@ def assemble_chunks(file_id, filename, dest_path=""):
         raise e
 
 
+def _is_empty(path):
+    """True if path has no entries — stops at the first one instead of
+    listing the whole directory"""
+    with os.scandir(path) as it:
+        return next(it, None) is None
+
+
 def cleanup_chunks(file_id, total_chunks=None):
     """Clean up temporary chunk files using Windows-safe deletion"""
     tmp_dir = os.path.join(ROOT_DIR, ".chunks", file_id)
@@ -410,7 +709,7 @@ def cleanup_chunks(file_id, total_chunks=None):
         if os.path.exists(chunks_dir):
             try:
                 # Only remove if it's actually empty
-                if not os.listdir(chunks_dir):
+                if _is_empty(chunks_dir):
                     os.rmdir(chunks_dir)
                     print("🧹 Removed empty chunks directory")
             except OSError:
@@ -419,6 +718,64 @@ def cleanup_chunks(file_id, total_chunks=None):
         print(f"⚠️ Warning: Could not cleanup chunks for {file_id}: {e}")
 
 
+# Chunk directories are independent, and each check is a handful of stats
+# plus possibly an rmtree — on slow storage a large backlog of abandoned
+# uploads is swept in parallel instead of one directory at a time.
+_CLEANUP_WORKERS = 16
+
+
+def _cleanup_old_chunk_dir(
+    file_id, chunk_dir, protected_files, current_time, max_age_hours
+):
+    """Age/protection checks and removal for one upload's chunk directory.
+    Returns True if the directory was removed."""
+    # CRITICAL: Never cleanup chunks for files currently being assembled
+    if file_id in protected_files:
+        print(f"🔐 Skipping cleanup for {file_id} - currently being assembled")
+        return False
+
+    # Also check for assembly protection marker. This is the only marker
+    # check per directory — any marker, fresh or expired, skips the
+    # directory, so nothing later needs to re-read it.
+    assembly_marker = os.path.join(chunk_dir, ".assembling")
+    if os.path.exists(assembly_marker):
+        print(f"🔐 Skipping cleanup for {file_id} - assembly marker present")
+        return False
+
+    should_cleanup = False
+    cleanup_reason = ""
+
+    # Upload age is the chunk directory's mtime — save_chunk() bumps it on
+    # every chunk. (A .timestamp file left by older versions is simply ignored.)
+    try:
+        dir_mtime = os.path.getmtime(chunk_dir)
+    except OSError:
+        dir_mtime = None
+
+    if dir_mtime is None:
+        # Can't get modification time, cleanup if doing aggressive cleanup
+        if max_age_hours <= 1:
+            should_cleanup = True
+            cleanup_reason = "no metadata available"
+    elif current_time - dir_mtime > max_age_hours * 3600:
+        should_cleanup = True
+        cleanup_reason = f"older than {max_age_hours}h"
+    elif max_age_hours > 1 and current_time - dir_mtime > 3600:
+        # ADDITIONAL CHECK: Clean up incomplete chunks that are older than
+        # 1 hour regardless of max_age_hours (for aborted uploads)
+        should_cleanup = True
+        cleanup_reason = "stale upload (>1hr old)"
+
+    if not should_cleanup:
+        return False
+
+    if safe_rmtree(chunk_dir):
+        print(f"🧹 Cleaned up chunks for file_id: {file_id} ({cleanup_reason})")
+        return True
+    print(f"❌ Failed to cleanup chunks for {file_id} ({cleanup_reason})")
+    return False
+
+
 def cleanup_old_chunks(max_age_hours=24, protected_files=None):
     """Enhanced cleanup function with Windows-safe deletion and assembly protection"""
     chunks_dir = os.path.join(ROOT_DIR, ".chunks")
@@ -429,121 +786,28 @@ def cleanup_old_chunks(max_age_hours=24, protected_files=None):
         protected_files = set()
 
     current_time = time.time()
-    max_age_seconds = max_age_hours * 3600
     cleaned_count = 0
 
     try:
-        for file_id in os.listdir(chunks_dir):
-            chunk_dir = os.path.join(chunks_dir, file_id)
-            if not os.path.isdir(chunk_dir):
-                continue
-
-            # CRITICAL: Never cleanup chunks for files currently being assembled
-            if file_id in protected_files:
-                print(f"🔐 Skipping cleanup for {file_id} - currently being assembled")
-                continue
-
-            # Also check for assembly protection marker
-            assembly_marker = os.path.join(chunk_dir, ".assembling")
-            if os.path.exists(assembly_marker):
-                print(f"🔐 Skipping cleanup for {file_id} - assembly marker present")
-                continue
-
-            should_cleanup = False
-            cleanup_reason = ""
-
-            # Check timestamp file
-            timestamp_file = os.path.join(chunk_dir, ".timestamp")
-            if os.path.exists(timestamp_file):
-                try:
-                    with open(timestamp_file, "r") as f:
-                        timestamp = float(f.read().strip())
-
-                    if current_time - timestamp > max_age_seconds:
-                        should_cleanup = True
-                        cleanup_reason = f"timestamp older than {max_age_hours}h"
-                except (ValueError, OSError):
-                    # If we can't read the timestamp, use directory modification time
-                    try:
-                        dir_mtime = os.path.getmtime(chunk_dir)
-                        if current_time - dir_mtime > max_age_seconds:
-                            should_cleanup = True
-                            cleanup_reason = "corrupted timestamp, using mtime"
-                    except OSError:
-                        # If we can't get mtime either, cleanup if very old max_age
-                        if max_age_hours <= 1:  # Only for aggressive cleanup
-                            should_cleanup = True
-                            cleanup_reason = "corrupted metadata"
-            else:
-                # No timestamp file, use directory modification time
-                try:
-                    dir_mtime = os.path.getmtime(chunk_dir)
-                    if current_time - dir_mtime > max_age_seconds:
-                        should_cleanup = True
-                        cleanup_reason = "no timestamp file, using mtime"
-                except OSError:
-                    # Can't get modification time, cleanup if doing aggressive cleanup
-                    if max_age_hours <= 1:
-                        should_cleanup = True
-                        cleanup_reason = "no metadata available"
-
-            # ADDITIONAL CHECK: Clean up incomplete chunks that are older than 1 hour
-            # regardless of the max_age_hours parameter (for aborted uploads)
-            if not should_cleanup and max_age_hours > 1:
-                one_hour_ago = current_time - 3600  # 1 hour in seconds
-                try:
-                    if os.path.exists(timestamp_file):
-                        with open(timestamp_file, "r") as f:
-                            timestamp = float(f.read().strip())
-                        if timestamp < one_hour_ago:
-                            should_cleanup = True
-                            cleanup_reason = "stale upload (>1hr old)"
-                    else:
-                        dir_mtime = os.path.getmtime(chunk_dir)
-                        if dir_mtime < one_hour_ago:
-                            should_cleanup = True
-                            cleanup_reason = "stale upload by mtime (>1hr old)"
-                except (ValueError, OSError):
-                    pass
+        with os.scandir(chunks_dir) as it:
+            chunk_dirs = [
+                (e.name, e.path) for e in it if e.is_dir(follow_symlinks=False)
+            ]
 
-            if should_cleanup:
-                # Check for assembly protection before cleanup
-                protection_file = os.path.join(chunk_dir, ".assembling")
-                if os.path.exists(protection_file):
-                    try:
-                        with open(protection_file, "r") as f:
-                            protection_data = f.read().strip()
-                            if protection_data.startswith("assembling:"):
-                                timestamp = float(protection_data.split(":", 1)[1])
-                                # Only skip cleanup if assembly started recently (within 10 minutes)
-                                if time.time() - timestamp < 600:
-                                    print(
-                                        f"🛡️ Skipping cleanup for {file_id} - assembly in progress"
-                                    )
-                                    continue
-                                else:
-                                    print(
-                                        f"⚠️ Assembly protection expired for {file_id}, proceeding with cleanup"
-                                    )
-                    except Exception as e:
-                        print(
-                            f"⚠️ Warning: Could not read protection file for {file_id}: {e}"
-                        )
+        def sweep(item):
+            file_id, chunk_dir = item
+            return _cleanup_old_chunk_dir(
+                file_id, chunk_dir, protected_files, current_time, max_age_hours
+            )
 
-                success = safe_rmtree(chunk_dir)
-                if success:
-                    cleaned_count += 1
-                    print(
-                        f"🧹 Cleaned up chunks for file_id: {file_id} ({cleanup_reason})"
-                    )
-                else:
-                    print(
-                        f"❌ Failed to cleanup chunks for {file_id} ({cleanup_reason})"
-                    )
+        if chunk_dirs:
+            workers = min(_CLEANUP_WORKERS, len(chunk_dirs))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                cleaned_count = sum(pool.map(sweep, chunk_dirs))
 
         # Try to remove the chunks directory if it's empty
         try:
-            if not os.listdir(chunks_dir):
+            if _is_empty(chunks_dir):
                 os.rmdir(chunks_dir)
                 print("🧹 Removed empty chunks directory")
         except OSError:
@@ -589,6 +853,7 @@ def create_folder(path, foldername):
         return False
     try:
         os.makedirs(folder_path)
+        invalidate_storage_stats()
         return True
     except Exception:
         return False
@@ -596,23 +861,32 @@ def create_folder(path, foldername):
 
 def delete_path(path):
     full_path = os.path.join(ROOT_DIR, path)
+    # One stat decides dir vs file (isdir + isfile was two)
     try:
-        if os.path.isdir(full_path):
-            return safe_rmtree(full_path)
-        elif os.path.isfile(full_path):
-            return safe_remove_file(full_path)
-        return True
+        mode = os.stat(full_path).st_mode
+    except OSError:
+        return True  # nothing there to delete
+    try:
+        if stat.S_ISDIR(mode):
+            removed = safe_rmtree(full_path)
+        elif stat.S_ISREG(mode):
+            removed = safe_remove_file(full_path)
+        else:
+            return True
     except (OSError, IOError):
         return False
+    # Only once it's gone — a refresh started earlier could re-count it
+    if removed:
+        invalidate_storage_stats()
+    return removed
 
 
 def get_file_size(path):
     """Get file size in bytes"""
     full_path = os.path.join(ROOT_DIR, path)
     try:
-        if os.path.isfile(full_path):
-            return os.path.getsize(full_path)
-        return 0
+        st = os.stat(full_path)
+        return st.st_size if stat.S_ISREG(st.st_mode) else 0
     except (OSError, IOError):
         return 0
 
@@ -622,21 +896,48 @@ def get_directory_size(path):
     full_path = os.path.join(ROOT_DIR, path)
     total_size = 0
     try:
-        if os.path.isfile(full_path):
-            return os.path.getsize(full_path)
-        elif os.path.isdir(full_path):
-            for dirpath, dirnames, filenames in os.walk(full_path):
-                for filename in filenames:
-                    file_path = os.path.join(dirpath, filename)
-                    try:
-                        total_size += os.path.getsize(file_path)
-                    except (OSError, IOError):
-                        continue
+        # One stat decides file vs directory
+        st = os.stat(full_path)
+        if stat.S_ISREG(st.st_mode):
+            return st.st_size
+        elif stat.S_ISDIR(st.st_mode):
+            for entry, _ in _walk_scandir(full_path, skip_hidden=False):
+                try:
+                    if not entry.is_dir(follow_symlinks=False):
+                        total_size += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
         return total_size
     except (OSError, IOError):
         return 0
 
 
+def _walk_scandir(path, skip_hidden=True):
+    """
+    Yield (DirEntry, depth) for everything below path, depth 0 being its direct
+    children. Symlinked directories are not descended into and unreadable
+    directories are skipped. Unlike os.walk + getsize, callers can take sizes
+    from entry.stat() — free on Windows, one stat per file elsewhere.
+    """
+    stack = [(path, 0)]
+    while stack:
+        current, depth = stack.pop()
+        try:
+            it = os.scandir(current)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if skip_hidden and entry.name.startswith("."):
+                    continue
+                yield entry, depth
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, depth + 1))
+                except OSError:
+                    continue
+
+
 def get_dir_info(path):
     """
     Get shallow item count + recursive total size for a directory.
@@ -649,10 +950,7 @@ def get_dir_info(path):
 
     # Try the in-memory index first — this is the fast path
     try:
-        from file_monitor import get_file_monitor
-
-        monitor = get_file_monitor()
-        cached = monitor.get_dir_info(rel_path)
+        cached = _get_file_monitor().get_dir_info(rel_path)
         if cached is not None:
             return {
                 "file_count": cached.get("file_count", 0),
@@ -671,39 +969,48 @@ def get_dir_info(path):
     dir_count = 0
     total_size = 0
 
-    try:
-        with os.scandir(full_path) as it:
-            for entry in it:
-                if entry.name.startswith("."):
-                    continue
-                if entry.is_dir(follow_symlinks=False):
+    # One descent: shallow counts from depth 0, sizes from every level
+    for entry, depth in _walk_scandir(full_path):
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if depth == 0:
+                if is_dir:
                     dir_count += 1
                 else:
                     file_count += 1
-
-        for dirpath, dirnames, filenames in os.walk(full_path):
-            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
-            for filename in filenames:
-                if filename.startswith("."):
-                    continue
-                try:
-                    total_size += os.path.getsize(os.path.join(dirpath, filename))
-                except (OSError, IOError):
-                    continue
-    except (OSError, IOError):
-        pass
+            if not is_dir:
+                total_size += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
 
     return {"file_count": file_count, "dir_count": dir_count, "total_size": total_size}
 
 
+# ROOT_DIR is bound once at import, so its resolved form is too — instead of
+# re-resolving it on every is_safe_path() call.
+_ROOT_REAL = os.path.realpath(ROOT_DIR)
+_ROOT_REAL_NC = os.path.normcase(_ROOT_REAL)
+
+
+def _within_root(p):
+    # commonpath, not startswith — "/srv/files2" must not pass for "/srv/files"
+    return os.path.normcase(os.path.commonpath([p, _ROOT_REAL])) == _ROOT_REAL_NC
+
+
 def is_safe_path(path):
     """Check if path is safe (no directory traversal)"""
     try:
-        # Resolve the path and check if it's within ROOT_DIR
-        resolved = os.path.realpath(os.path.join(ROOT_DIR, path))
-        root_real = os.path.realpath(ROOT_DIR)
-        return resolved.startswith(root_real)
-    except:
+        joined = os.path.join(_ROOT_REAL, path)
+        # Lexical pre-filter — rejects plain ../ traversal without touching
+        # the disk. It can only reject: normpath collapses "link/.." as text,
+        # which the kernel resolves through the link's target instead.
+        if not _within_root(os.path.normpath(joined)):
+            return False
+        # Resolve symlinks on the un-normalised path, so a link inside
+        # ROOT_DIR can't lead outside it
+        return _within_root(os.path.realpath(joined))
+    except (ValueError, OSError):
+        # ValueError: different drives on Windows, or an embedded NUL
         return False
 
 
@@ -719,199 +1026,311 @@ def is_valid_path(path):
     # Check if path exists and is a directory
     try:
         full_path = os.path.join(ROOT_DIR, path)
-        return os.path.exists(full_path) and os.path.isdir(full_path)
+        return os.path.isdir(full_path)  # False for missing paths too
     except:
         return False
 
 
-def get_storage_stats():
-    """Get storage statistics with enhanced Android/Termux compatibility"""
-    try:
-        print(f"📊 Getting storage stats for ROOT_DIR: {ROOT_DIR}")
-        print(
-            f"📊 Platform: {os.name}, hasattr(os, 'statvfs'): {hasattr(os, 'statvfs')}"
-        )
+def _statvfs_usage(path):
+    """(total, used, free) from statvfs — free is the space available to
+    unprivileged users, matching what the storage panel shows."""
+    st = os.statvfs(path)
+    total = st.f_blocks * st.f_frsize
+    free = st.f_bavail * st.f_frsize
+    return total, total - free, free
 
-        # Determine the best path for disk usage calculation
-        disk_usage_path = ROOT_DIR
 
-        # Special handling for Android/Termux
-        if "TERMUX_VERSION" in os.environ or os.path.exists("/data/data/com.termux"):
-            print("📱 Detected Termux/Android environment")
+def _resolve_disk_usage_path():
+    """Pick the path whose filesystem the disk stats should describe"""
+    if _IS_TERMUX:
+        # Android shared storage gives the figures users expect to see
+        for path in ("/storage/emulated/0", "/sdcard", "/storage/self/primary"):
+            if os.access(path, os.R_OK):
+                print(f"📱 Using Android storage path for disk usage: {path}")
+                return path
+    return ROOT_DIR
 
-            # For Termux, try to use the Android shared storage path for more accurate disk usage
-            android_storage_paths = [
-                "/storage/emulated/0",  # Main internal storage
-                "/sdcard",  # Alternative path
-                "/storage/self/primary",  # Another alternative
-            ]
 
-            for path in android_storage_paths:
-                if os.path.exists(path) and os.access(path, os.R_OK):
-                    disk_usage_path = path
-                    print(
-                        f"📱 Using Android storage path for disk usage: {disk_usage_path}"
-                    )
-                    break
+# The platform and storage mount don't change while running — resolved once
+# instead of re-probing the Termux/Android paths on every stats request.
+_IS_TERMUX = "TERMUX_VERSION" in os.environ or os.path.isdir("/data/data/com.termux")
+_disk_usage = _statvfs_usage if hasattr(os, "statvfs") else shutil.disk_usage
+_DISK_USAGE_PATH = _resolve_disk_usage_path()
 
-            if disk_usage_path == ROOT_DIR:
-                print(f"📱 Using ROOT_DIR for disk usage: {disk_usage_path}")
 
-        # Get total, used, and free space
-        if hasattr(os, "statvfs"):  # Unix-like systems (Linux, Android/Termux)
-            print("📊 Using os.statvfs for disk usage")
+def get_disk_usage():
+    """
+    Total/used/free bytes for the storage filesystem — one statvfs (or
+    GetDiskFreeSpaceEx) call, cheap enough for dashboard polling.
+    """
+    try:
+        total, used, free = _disk_usage(_DISK_USAGE_PATH)
+    except OSError as e:
+        print(f"❌ Disk usage failed on {_DISK_USAGE_PATH}: {e}")
+        total = used = free = 0
+        if _DISK_USAGE_PATH != ROOT_DIR:
+            # Try ROOT_DIR as last resort
             try:
-                stat = os.statvfs(disk_usage_path)
-                print(
-                    f"📊 statvfs result: f_blocks={stat.f_blocks}, f_frsize={stat.f_frsize}, f_bavail={stat.f_bavail}"
-                )
-                total = stat.f_blocks * stat.f_frsize
-                free = stat.f_bavail * stat.f_frsize
-                used = total - free
-                print(
-                    f"📊 Calculated disk usage - Total: {total}, Used: {used}, Free: {free}"
-                )
-            except OSError as e:
-                print(
-                    f"❌ statvfs failed on {disk_usage_path}: {e}, trying shutil fallback"
-                )
-                # Fallback to shutil.disk_usage for Android/Termux if statvfs fails
-                try:
-                    import shutil
+                total, used, free = shutil.disk_usage(ROOT_DIR)
+            except OSError as final_e:
+                print(f"❌ All disk usage methods failed: {final_e}")
+    return {"total_space": total, "used_space": used, "free_space": free}
+
+
+def invalidate_storage_stats():
+    """Have the background refresher re-walk now, not at the next interval"""
+    _stats_refresh.set()
+
+
+# get_storage_stats() never walks the tree on the caller's thread after the
+# first call: a daemon thread refreshes the content stats every
+# _STATS_REFRESH_INTERVAL seconds (sooner after invalidate_storage_stats())
+# and callers get the last snapshot, so pollers can't tie up request threads.
+_STATS_REFRESH_INTERVAL = 30.0
+_latest_content_stats = None
+_stats_lock = threading.Lock()
+_stats_refresh = threading.Event()
+_stats_thread = None
+
+
+def _stats_loop():
+    global _latest_content_stats, _stats_thread
+    while True:
+        _stats_refresh.wait(_STATS_REFRESH_INTERVAL)
+        _stats_refresh.clear()
+        # Only a stand-in until file_monitor has an index; once it does,
+        # get_storage_stats() never reads this snapshot again
+        if _indexed_content_stats() is not None:
+            with _stats_lock:
+                _stats_thread = None
+            print("📊 File monitor index ready - stopping storage stats refresher")
+            return
+        try:
+            stats = get_content_stats()
+        except Exception as e:
+            print(f"❌ Error in storage stats refresher: {e}")
+            continue
+        with _stats_lock:
+            _latest_content_stats = stats
+
+
+def _latest_stats():
+    """Copy of the last content stats; the first call walks once and starts
+    the refresher thread"""
+    global _latest_content_stats, _stats_thread
+    with _stats_lock:
+        if _stats_thread is None:
+            _latest_content_stats = get_content_stats()
+            _stats_thread = threading.Thread(target=_stats_loop, daemon=True)
+            _stats_thread.start()
+            print("📊 Started background storage stats refresher")
+        return dict(_latest_content_stats)
+
+
+def _indexed_content_stats():
+    """Content stats from file_monitor's index (storage_index.json, kept
+    current by watchdog and periodic reconciles) — no filesystem access.
+    None until the monitor has a snapshot."""
+    try:
+        snapshot = _get_file_monitor().get_current_snapshot()
+    except Exception as e:
+        print(f"⚠️ File monitor snapshot unavailable: {e}")
+        return None
+    if snapshot is None:
+        return None
+    return {
+        "file_count": snapshot.file_count,
+        "dir_count": snapshot.dir_count,
+        "content_size": snapshot.total_size,
+    }
 
-                    total, used, free = shutil.disk_usage(disk_usage_path)
-                    print(
-                        f"📊 Fallback shutil.disk_usage on {disk_usage_path} - Total: {total}, Used: {used}, Free: {free}"
-                    )
-                except Exception as fallback_e:
-                    print(f"❌ Fallback also failed on {disk_usage_path}: {fallback_e}")
-                    # Try ROOT_DIR as last resort
-                    if disk_usage_path != ROOT_DIR:
-                        print(f"📊 Trying ROOT_DIR as last resort: {ROOT_DIR}")
-                        try:
-                            import shutil
-
-                            total, used, free = shutil.disk_usage(ROOT_DIR)
-                            print(
-                                f"📊 ROOT_DIR disk usage - Total: {total}, Used: {used}, Free: {free}"
-                            )
-                        except Exception as final_e:
-                            print(f"❌ All disk usage methods failed: {final_e}")
-                            total = used = free = 0
-                    else:
-                        total = used = free = 0
-        else:  # Windows
-            print("📊 Using shutil.disk_usage for Windows")
-            import shutil
-
-            total, used, free = shutil.disk_usage(ROOT_DIR)
-            print(f"📊 Windows disk usage - Total: {total}, Used: {used}, Free: {free}")
-
-        # First, return disk stats immediately - this is the critical info
-        disk_stats = {
-            "total_space": total,
-            "used_space": used,
-            "free_space": free,
-        }
-        print(f"📊 Disk stats ready: {disk_stats}")
 
-        # Now try to count files with timeout protection
-        print(f"📊 Starting file and directory counting in: {ROOT_DIR}")
+# Concurrent readdir overlaps well on SSD/NVMe and network storage
+_CONTENT_SCAN_WORKERS = min(8, (os.cpu_count() or 1) * 2)
 
-        file_count = 0
-        dir_count = 0
-        total_size = 0
 
-        try:
-            # Add timeout protection for file counting (web-safe version)
-            import time
+# Where scandir() accepts a directory fd (POSIX), the walk lists each
+# directory through one, so entry.stat() is an fstatat() on the bare name
+# instead of the kernel resolving the full path again for every file.
+_SCAN_BY_FD = os.scandir in os.supports_fd
+_DIR_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0)
 
-            start_time = time.time()
-            max_files_to_check = 10000  # Limit for very large directories
-            files_checked = 0
-            timeout_seconds = 5
 
-            print(
-                f"📊 Starting file walk with {timeout_seconds}s timeout and {max_files_to_check} file limit"
-            )
+# Entries handled between checks of the walk's timeout and file limit
+_SCAN_BATCH = 128
+# Walk errors kept for the end-of-walk summary; the rest are only counted
+_SCAN_ERROR_SAMPLES = 10
 
-            for root, dirs, files in os.walk(ROOT_DIR):
-                # Skip hidden directories like .chunks
-                dirs[:] = [d for d in dirs if not d.startswith(".")]
 
-                # Check timeout manually (web-safe approach)
-                elapsed = time.time() - start_time
-                if elapsed > timeout_seconds:
+def _scan_content_dir(path, expired, limit):
+    """One directory's share of the content walk:
+    (subdirs, file_count, size, error_samples, error_count).
+    Stops early, in _SCAN_BATCH steps, once the walk's expired future is
+    resolved or limit files have been counted here."""
+    subdirs = []
+    files = 0
+    size = 0
+    errors = []
+    failed = 0
+    if expired.done():
+        return subdirs, files, size, errors, failed
+    add_subdir = subdirs.append  # bound once for the per-entry loop
+    join = os.path.join
+    dir_fd = os.open(path, _DIR_OPEN_FLAGS) if _SCAN_BY_FD else None
+    try:
+        # Entries listed from an fd carry only their name as .path
+        with os.scandir(path if dir_fd is None else dir_fd) as it:
+            while True:
+                batch = list(islice(it, _SCAN_BATCH))
+                if not batch:
+                    break
+                for entry in batch:
+                    # Skip hidden entries like .chunks
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            add_subdir(join(path, entry.name))
+                            continue
+                        files += 1
+                        size += entry.stat(follow_symlinks=False).st_size
+                    except OSError as file_error:
+                        # Collected, not printed: an unreadable directory
+                        # would otherwise flood stdout under its lock
+                        failed += 1
+                        if failed <= _SCAN_ERROR_SAMPLES:
+                            errors.append(f"{join(path, entry.name)}: {file_error}")
+                if files >= limit or expired.done():
+                    break
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+    return subdirs, files, size, errors, failed
+
+
+def get_content_stats():
+    """
+    File/dir counts and total content size from a walk of ROOT_DIR, bounded
+    by a timeout and a file limit (partial results past either). This is the
+    expensive half of get_storage_stats() — keep it off polling paths.
+    """
+    # Now try to count files with timeout protection
+    print(f"📊 Starting file and directory counting in: {ROOT_DIR}")
+
+    file_count = 0
+    dir_count = 0
+    total_size = 0
+
+    try:
+        # Add timeout protection for file counting (web-safe version)
+        start_time = time.time()
+        max_files_to_check = 10000  # Limit for very large directories
+        files_checked = 0
+        timeout_seconds = 5
+
+        print(
+            f"📊 Starting file walk with {timeout_seconds}s timeout and {max_files_to_check} file limit"
+        )
+
+        error_samples = []
+        error_count = 0
+
+        # Directories are scanned concurrently, one task each; this thread
+        # only tallies results and queues subdirectories, so the file limit
+        # is enforced as results come back. The timeout is a Timer that
+        # resolves the expired future: it wakes wait() below and tells
+        # queued scans to skip, without reading the clock per directory.
+        expired = Future()
+        timer = threading.Timer(timeout_seconds, expired.set_result, (None,))
+        timer.daemon = True
+        timer.start()
+        pool = ThreadPoolExecutor(max_workers=_CONTENT_SCAN_WORKERS)
+        submit = pool.submit
+        try:
+            pending = {
+                expired,
+                submit(_scan_content_dir, ROOT_DIR, expired, max_files_to_check),
+            }
+            while len(pending) > 1:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future is expired:
+                        continue
+                    try:
+                        subdirs, files, size, errors, failed = future.result()
+                    except OSError as dir_error:
+                        errors, failed = [f"listing failed: {dir_error}"], 1
+                        subdirs, files, size = (), 0, 0
+
+                    error_count += failed
+                    if len(error_samples) < _SCAN_ERROR_SAMPLES:
+                        error_samples.extend(errors)
+
+                    dir_count += len(subdirs)
+                    file_count += files
+                    files_checked += files
+                    total_size += size
+                    # Each new scan may use whatever is left of the limit
+                    limit = max_files_to_check - files_checked
+                    for subdir in subdirs:
+                        pending.add(submit(_scan_content_dir, subdir, expired, limit))
+
+                if expired in done:
                     print(
-                        f"⏱️ File counting timeout reached ({elapsed:.1f}s), using partial results"
+                        f"⏱️ File counting timeout reached ({time.time() - start_time:.1f}s), using partial results"
                     )
                     print(
                         f"📊 Partial results: {file_count} files, {dir_count} dirs, {files_checked} files checked"
                     )
                     break
 
-                dir_count += len(dirs)
-                file_count += len(files)
-
-                # Process files in batches to check timeout more frequently
-                for i, file in enumerate(files):
-                    try:
-                        if files_checked >= max_files_to_check:
-                            print(
-                                f"📊 Reached max file check limit ({max_files_to_check}), using partial results"
-                            )
-                            break
-
-                        file_path = os.path.join(root, file)
-                        file_size = os.path.getsize(file_path)
-                        total_size += file_size
-                        files_checked += 1
-
-                        # Check timeout every 100 files or every 500ms
-                        if (files_checked % 100 == 0) or (
-                            time.time() - start_time > timeout_seconds
-                        ):
-                            elapsed = time.time() - start_time
-                            if elapsed > timeout_seconds:
-                                print(
-                                    f"⏱️ File counting timeout during size calculation ({elapsed:.1f}s)"
-                                )
-                                break
-                    except (OSError, IOError) as file_error:
-                        print(f"⚠️ Could not get size for {file_path}: {file_error}")
-                        continue
-
-                # Break out of directory loop if timeout occurred
-                if (
-                    time.time() - start_time > timeout_seconds
-                    or files_checked >= max_files_to_check
-                ):
+                if files_checked >= max_files_to_check:
+                    print(
+                        f"📊 Reached max file check limit ({max_files_to_check}), using partial results"
+                    )
                     break
+        finally:
+            timer.cancel()
+            # Drop queued directories; ones already being scanned finish
+            # in the background and are discarded
+            pool.shutdown(wait=False, cancel_futures=True)
 
-            elapsed = time.time() - start_time
+        if error_count:
             print(
-                f"📊 File counting complete in {elapsed:.2f}s - Files: {file_count}, Dirs: {dir_count}, Total size: {total_size} (checked {files_checked} files)"
+                f"⚠️ {error_count} entries could not be read during the walk, first: {error_samples[:_SCAN_ERROR_SAMPLES]}"
             )
 
-        except TimeoutError:
-            print(
-                "⏱️ File counting timed out, returning disk stats with partial file info"
-            )
-        except Exception as walk_e:
-            print(f"❌ Error during file walk: {walk_e}")
-            import traceback
-
-            traceback.print_exc()
-            # Continue with partial or 0 values for file counts
-
-        result = {
-            "total_space": total,
-            "used_space": used,
-            "free_space": free,
-            "file_count": file_count,
-            "dir_count": dir_count,
-            "content_size": total_size,
-        }
+        elapsed = time.time() - start_time
+        print(
+            f"📊 File counting complete in {elapsed:.2f}s - Files: {file_count}, Dirs: {dir_count}, Total size: {total_size} (checked {files_checked} files)"
+        )
+
+    except Exception as walk_e:
+        print(f"❌ Error during file walk: {walk_e}")
+        import traceback
+
+        traceback.print_exc()
+        # Continue with partial or 0 values for file counts
+
+    return {
+        "file_count": file_count,
+        "dir_count": dir_count,
+        "content_size": total_size,
+    }
+
+
+def get_storage_stats():
+    """Get storage statistics with enhanced Android/Termux compatibility"""
+    try:
+        print(f"📊 Getting storage stats for ROOT_DIR: {ROOT_DIR}")
+
+        # First, disk stats - this is the critical info
+        result = get_disk_usage()
+        print(f"📊 Disk stats ready: {result}")
+
+        # The monitor's running totals when it has them; the walk-based
+        # snapshot only covers startup before its first index is built
+        result.update(_indexed_content_stats() or _latest_stats())
 
         print(f"📊 Final storage stats result: {result}")
         return result
@@ -931,10 +1350,16 @@ def get_storage_stats():
         }
 
 
+# ROOT_DIR with exactly one trailing separator, so move/copy can build full
+# paths by concatenation. Leading separators are stripped from the relative
+# part (os.path.join would treat "/x" as absolute and drop ROOT_DIR).
+_ROOT_PREFIX = os.path.join(os.path.normpath(ROOT_DIR), "")
+
+
 def move_item(source_path, dest_path):
     """Move a file or directory from source to destination"""
-    source_full = os.path.join(ROOT_DIR, source_path)
-    dest_full = os.path.join(ROOT_DIR, dest_path)
+    source_full = _ROOT_PREFIX + source_path.lstrip("/\\")
+    dest_full = _ROOT_PREFIX + dest_path.lstrip("/\\")
 
     try:
         # Ensure destination directory exists
@@ -951,8 +1376,8 @@ def move_item(source_path, dest_path):
 
 def copy_item(source_path, dest_path):
     """Copy a file or directory from source to destination"""
-    source_full = os.path.join(ROOT_DIR, source_path)
-    dest_full = os.path.join(ROOT_DIR, dest_path)
+    source_full = _ROOT_PREFIX + source_path.lstrip("/\\")
+    dest_full = _ROOT_PREFIX + dest_path.lstrip("/\\")
 
     try:
         # Ensure destination directory exists
@@ -961,29 +1386,41 @@ def copy_item(source_path, dest_path):
 
         # Perform the copy
         if os.path.isdir(source_full):
-            shutil.copytree(source_full, dest_full)
+            shutil.copytree(source_full, dest_full, copy_function=_fast_copy)
         else:
-            shutil.copy2(source_full, dest_full)
+            _fast_copy(source_full, dest_full)
+        invalidate_storage_stats()
         return True
     except (OSError, IOError, shutil.Error) as e:
         print(f"❌ Error copying {source_path} to {dest_path}: {e}")
         return False
 
 
-def get_chunk_info():
-    """Get information about current chunk usage"""
+def get_chunk_info(detailed=True):
+    """Get information about current chunk usage.
+    detailed=False only counts upload directories: total_chunk_size is -1
+    and chunk_dirs empty, and no chunk directory is opened."""
     chunks_dir = os.path.join(ROOT_DIR, ".chunks")
-    if not os.path.exists(chunks_dir):
-        return {"total_chunk_dirs": 0, "total_chunk_size": 0, "chunk_dirs": []}
-
     chunk_dirs = []
     total_size = 0
 
     try:
-        for file_id in os.listdir(chunks_dir):
-            chunk_dir = os.path.join(chunks_dir, file_id)
-            if not os.path.isdir(chunk_dir):
-                continue
+        # A missing .chunks lands in the OSError handler: all totals zero
+        with os.scandir(chunks_dir) as chunk_entries:
+            chunk_entries = [
+                e for e in chunk_entries if e.is_dir(follow_symlinks=False)
+            ]
+
+        if not detailed:
+            return {
+                "total_chunk_dirs": len(chunk_entries),
+                "total_chunk_size": -1,
+                "chunk_dirs": [],
+            }
+
+        for dir_entry in chunk_entries:
+            file_id = dir_entry.name
+            chunk_dir = dir_entry.path
 
             # Calculate size of this chunk directory
             dir_size = 0
@@ -991,21 +1428,18 @@ def get_chunk_info():
             timestamp = None
 
             try:
-                # Get timestamp
-                timestamp_file = os.path.join(chunk_dir, ".timestamp")
-                if os.path.exists(timestamp_file):
-                    with open(timestamp_file, "r") as f:
-                        timestamp = float(f.read().strip())
+                # Last chunk write — save_chunk() bumps the directory mtime.
+                # The DirEntry caches it (free from the listing on Windows).
+                timestamp = dir_entry.stat().st_mtime
 
                 # Count chunks and calculate size
-                for item in os.listdir(chunk_dir):
-                    if item == ".timestamp":
-                        continue
-                    chunk_file = os.path.join(chunk_dir, item)
-                    if os.path.isfile(chunk_file):
-                        size = os.path.getsize(chunk_file)
-                        dir_size += size
-                        chunk_count += 1
+                with os.scandir(chunk_dir) as it:
+                    for entry in it:
+                        if entry.name == ".timestamp":
+                            continue
+                        if entry.is_file(follow_symlinks=False):
+                            dir_size += entry.stat(follow_symlinks=False).st_size
+                            chunk_count += 1
 
                 total_size += dir_size
 
@@ -1057,38 +1491,41 @@ def manual_chunks_cleanup():
 
         # Get information about what we're cleaning
         chunk_info = []
+        chunk_files = []
         total_size = 0
 
-        for file_id in os.listdir(chunks_dir):
-            chunk_dir = os.path.join(chunks_dir, file_id)
-            if not os.path.isdir(chunk_dir):
-                continue
+        with os.scandir(chunks_dir) as chunk_entries:
+            chunk_entries = [
+                e for e in chunk_entries if e.is_dir(follow_symlinks=False)
+            ]
+
+        for dir_entry in chunk_entries:
+            file_id = dir_entry.name
+            chunk_dir = dir_entry.path
 
             try:
                 dir_size = 0
                 chunk_count = 0
                 timestamp = None
 
-                # Get timestamp if available
-                timestamp_file = os.path.join(chunk_dir, ".timestamp")
-                if os.path.exists(timestamp_file):
-                    try:
-                        with open(timestamp_file, "r") as f:
-                            timestamp = float(f.read().strip())
-                    except (ValueError, OSError):
-                        pass
+                # Last chunk write — save_chunk() bumps the directory mtime
+                try:
+                    timestamp = dir_entry.stat().st_mtime
+                except OSError:
+                    pass
 
                 # Count chunks and calculate size
-                for item in os.listdir(chunk_dir):
-                    item_path = os.path.join(chunk_dir, item)
-                    if os.path.isfile(item_path):
-                        try:
-                            size = os.path.getsize(item_path)
-                            if item != ".timestamp":
-                                chunk_count += 1
-                            dir_size += size
-                        except OSError:
-                            pass
+                with os.scandir(chunk_dir) as it:
+                    for entry in it:
+                        if entry.is_file(follow_symlinks=False):
+                            chunk_files.append(entry.path)
+                            try:
+                                size = entry.stat(follow_symlinks=False).st_size
+                                if entry.name != ".timestamp":
+                                    chunk_count += 1
+                                dir_size += size
+                            except OSError:
+                                pass
 
                 total_size += dir_size
                 age_minutes = (time.time() - timestamp) / 60 if timestamp else None
@@ -1134,6 +1571,22 @@ def manual_chunks_cleanup():
             if len(chunk_info) > 10:
                 print(f"  ... and {len(chunk_info) - 10} more directories")
 
+        # Unlink the chunk files in parallel first, so safe_rmtree() is
+        # left with empty directories plus anything that refused to go
+        # (read-only or in-use files on Windows), which it handles
+        if chunk_files:
+
+            def unlink(path):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+            workers = min(_CLEANUP_WORKERS, len(chunk_files))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for path in chunk_files:
+                    pool.submit(unlink, path)
+
         # Perform the cleanup using Windows-safe deletion
         success = safe_rmtree(chunks_dir)
 
@@ -1161,15 +1614,19 @@ def emergency_cleanup_all():
         temp_files_removed = 0
 
         # Try to clean up any .tmp files in root directory
-        for item in os.listdir(ROOT_DIR):
-            if item.endswith(".tmp") or item.endswith(".part"):
-                temp_file = os.path.join(ROOT_DIR, item)
-                try:
-                    if safe_remove_file(temp_file):
-                        temp_files_removed += 1
-                        print(f"🧹 Removed temp file: {item}")
-                except Exception as e:
-                    print(f"⚠️  Could not remove temp file {item}: {e}")
+        with os.scandir(ROOT_DIR) as it:
+            for entry in it:
+                item = entry.name
+                # Name test first; is_file() comes from the directory entry
+                if item.endswith((".tmp", ".part")) and entry.is_file(
+                    follow_symlinks=False
+                ):
+                    try:
+                        if safe_remove_file(entry.path):
+                            temp_files_removed += 1
+                            print(f"🧹 Removed temp file: {item}")
+                    except Exception as e:
+                        print(f"⚠️  Could not remove temp file {item}: {e}")
 
         # Clean up chunks directory
         manual_chunks_cleanup()
@@ -1185,4 +1642,4 @@ def emergency_cleanup_all():
 
 
 print(f"📦 Storage module loaded with Windows support - cleanup managed by app.py")
-print(f"🪟 Platform: {os.name} ({'Windows' if os.name == 'nt' else 'Unix-like'})")
+print(f"🪟 Platform: {os.name} ({'Windows' if _IS_WIN else 'Unix-like'})")